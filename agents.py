@@ -1,26 +1,66 @@
-import imp
 from crewai import LLM, Agent
 from langchain_ollama import OllamaLLM
 
+import functools
 import os
+from typing import Literal, Optional, cast
 
 from tools.calculator import CalculatorTool
 from tools.search import *
 from tools.sec import *
 
-tool_search_internet = SearchInternetTool()
-tool_search_news = SearchNewsTool()
-tool_search_yahoo_finance = YahooFinanceNewsTool()
-tool_calculator = CalculatorTool()
-tool_search_10q = Search10QTool()
-tool_search_10k = Search10KTool()
+
+# Tools are built on first use and then shared by every agent, so importing
+# this module stays cheap and unused tools are never constructed.
+@functools.cache
+def tool_search_internet():
+    return SearchInternetTool()
+
+
+@functools.cache
+def tool_search_news():
+    return SearchNewsTool()
+
+
+@functools.cache
+def tool_search_yahoo_finance():
+    return YahooFinanceNewsTool()
+
+
+@functools.cache
+def tool_calculator():
+    return CalculatorTool()
+
+
+@functools.cache
+def tool_search_10q():
+    return Search10QTool()
+
+
+@functools.cache
+def tool_search_10k():
+    return Search10KTool()
+
+
+LLMBackend = Literal["litellm", "ollama"]
+
+
+@functools.cache
+def _build_llm(backend: LLMBackend, model: str, base_url: str):
+    if backend == "ollama":
+        return OllamaLLM(model=model, base_url=base_url)
+    if backend == "litellm":
+        return LLM(model=model, base_url=base_url)
+    raise ValueError(f"Unsupported LLM backend '{backend}'. Use 'ollama' or 'litellm'.")
 
 
 class StockAnalysisAgents:
-    def __init__(self):
-        self.llm = OllamaLLM(
-            model=os.environ["MODEL"],
-            base_url=os.environ["MODEL_BASE_URL"],
+    def __init__(self, llm_backend: Optional[LLMBackend] = None):
+        backend = llm_backend or os.environ.get("LLM_BACKEND", "ollama")
+        self.llm = _build_llm(
+            cast(LLMBackend, backend.strip().lower()),
+            os.environ["MODEL"],
+            os.environ["MODEL_BASE_URL"],
         )
 
     def financial_analyst(self):
@@ -34,10 +74,10 @@ class StockAnalysisAgents:
       and analyze financial data to provide comprehensive insights""",
             verbose=True,
             tools=[
-                tool_search_internet,
-                tool_calculator,
-                tool_search_10q,
-                tool_search_10k,
+                tool_search_internet(),
+                tool_calculator(),
+                tool_search_10q(),
+                tool_search_10k(),
             ],
             llm=self.llm,
         )
@@ -54,11 +94,11 @@ class StockAnalysisAgents:
       important customer.""",
             verbose=True,
             tools=[
-                tool_search_internet,
-                tool_search_news,
-                tool_search_yahoo_finance,
-                tool_search_10q,
-                tool_search_10k,
+                tool_search_internet(),
+                tool_search_news(),
+                tool_search_yahoo_finance(),
+                tool_search_10q(),
+                tool_search_10k(),
             ],
             llm=self.llm,
         )
@@ -75,10 +115,16 @@ class StockAnalysisAgents:
       a super important customer you need to impress.""",
             verbose=True,
             tools=[
-                tool_search_internet,
-                tool_search_news,
-                tool_calculator,
-                tool_search_yahoo_finance,
+                tool_search_internet(),
+                tool_search_news(),
+                tool_calculator(),
+                tool_search_yahoo_finance(),
             ],
             llm=self.llm,
         )
+
+
+def make_agents(llm_backend: Optional[LLMBackend] = None) -> StockAnalysisAgents:
+    """Build the agent factory for the requested backend (defaults to ``LLM_BACKEND``)."""
+
+    return StockAnalysisAgents(llm_backend)
@@ -1,23 +1,37 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
-from queue import Queue
-
-EXCLUDED_FIELDS = {
-    "task",
-    "from_task",
-    "from_agent",
-    "agent",
-    "tool",
-    "tool_instance",
-    "crew",
-    "crew_instance",
-    "llm",
-    "callbacks",
-    "memory",
-    "knowledge",
-}
+from typing import Any, Callable, Collection, Deque, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+EXCLUDED_FIELDS: frozenset[str] = frozenset(
+    {
+        "task",
+        "from_task",
+        "from_agent",
+        "agent",
+        "tool",
+        "tool_instance",
+        "crew",
+        "crew_instance",
+        "llm",
+        "callbacks",
+        "memory",
+        "knowledge",
+    }
+)
 
 from crewai.events import (
     AgentExecutionCompletedEvent,
@@ -36,14 +50,313 @@ from crewai.events import (
 )
 from crewai.utilities.serialization import to_serializable
 
+# Payloads are handed to the consumer in batches of up to BATCH_SIZE events, or
+# whatever has accumulated after BATCH_INTERVAL seconds, whichever comes first.
+BATCH_SIZE = 16
+BATCH_INTERVAL = 0.05
+_FLUSH_IMMEDIATELY = {"crew:kickoff-completed", "crew:kickoff-failed"}
+# Upper bound on undrained payloads, and how long a consumer may go without
+# draining before the listener treats it as gone (e.g. the browser tab closed).
+MAX_BUFFERED_EVENTS = 4096
+CONSUMER_TIMEOUT = 30.0
+# A tool:finished arriving within this window of its still-buffered
+# tool:started is merged with it into a single tool:completed event.
+TOOL_COALESCE_WINDOW = 0.005
+
+# Fields the dashboard reads from each CrewAI event type. Known events are
+# serialised by pulling exactly these attributes instead of walking the whole
+# event; unknown types fall back to the generic serializer.
+_BASE_EVENT_FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "type",
+    "source_fingerprint",
+    "source_type",
+    "task_id",
+    "task_name",
+    "agent_id",
+    "agent_role",
+)
+_TOOL_EVENT_FIELDS: Tuple[str, ...] = _BASE_EVENT_FIELDS + (
+    "agent_key",
+    "tool_name",
+    "tool_args",
+    "tool_class",
+    "run_attempts",
+    "delegations",
+)
+_EVENT_FIELDS: Dict[type, Tuple[str, ...]] = {
+    CrewKickoffStartedEvent: _BASE_EVENT_FIELDS + ("crew_name", "inputs"),
+    CrewKickoffCompletedEvent: _BASE_EVENT_FIELDS + ("crew_name", "output", "total_tokens"),
+    CrewKickoffFailedEvent: _BASE_EVENT_FIELDS + ("crew_name", "error"),
+    TaskStartedEvent: _BASE_EVENT_FIELDS + ("context",),
+    TaskCompletedEvent: _BASE_EVENT_FIELDS + ("output",),
+    TaskFailedEvent: _BASE_EVENT_FIELDS + ("error",),
+    AgentExecutionStartedEvent: _BASE_EVENT_FIELDS + ("task_prompt",),
+    AgentExecutionCompletedEvent: _BASE_EVENT_FIELDS + ("output",),
+    AgentExecutionErrorEvent: _BASE_EVENT_FIELDS + ("error",),
+    ToolUsageStartedEvent: _TOOL_EVENT_FIELDS,
+    ToolUsageFinishedEvent: _TOOL_EVENT_FIELDS + ("started_at", "finished_at", "from_cache", "output"),
+    ToolUsageErrorEvent: _TOOL_EVENT_FIELDS + ("error",),
+}
+_PLAIN_TYPES = (str, int, float, bool)
+
+
+def _plain_value(value: Any) -> Any:
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return to_serializable(value, exclude=EXCLUDED_FIELDS, max_depth=3)
+
+
+def _build_extractor(fields: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    def extract(event: Any) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for field in fields:
+            value = getattr(event, field, None)
+            if value is not None:
+                data[field] = _plain_value(value)
+        return data
+
+    return extract
+
+
+_EVENT_EXTRACTORS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    event_class: _build_extractor(fields) for event_class, fields in _EVENT_FIELDS.items()
+}
+
+_ISO_PREFIX_CACHE: tuple[int, str] = (-1, "")
+
+
+def utc_isoformat() -> str:
+    """Return the current UTC time laid out like ``datetime.isoformat()``.
+
+    The ``YYYY-MM-DDTHH:MM:SS`` prefix is formatted once per second and reused,
+    so each call only formats the microsecond suffix.
+    """
+
+    global _ISO_PREFIX_CACHE
+
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    cached_seconds, prefix = _ISO_PREFIX_CACHE
+    if cached_seconds != seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _ISO_PREFIX_CACHE = (seconds, prefix)
+    return f"{prefix}.{nanoseconds // 1000:06d}"
+
+
+ToolSignature = Tuple[str, str, str]
+
+
+def _normalise_tool_args(args: Any) -> str:
+    """Return a stable fingerprint of a tool call's arguments.
+
+    The value is only compared for equality, so serialised arguments are
+    reduced to a short digest of their key-sorted JSON.
+    """
+
+    if args is None:
+        return ""
+    if isinstance(args, str):
+        stripped = args.strip()
+        if not stripped:
+            return ""
+        try:
+            args = _json_loads(stripped)
+        except ValueError:
+            return stripped
+    try:
+        encoded = _json_dumps_sorted(args)
+    except TypeError:
+        return repr(args)
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps_sorted(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS, default=str)
+        except TypeError:
+            # orjson rejects non-string keys and oversized ints; json copes.
+            return json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+
+else:  # pragma: no cover - orjson is installed alongside crewai
+    _json_loads = json.loads
+
+    def _json_dumps_sorted(value: Any) -> bytes:
+        return json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+
+
+def tool_signature(event_data: Dict[str, Any]) -> ToolSignature:
+    """Identify a tool invocation as (agent identifier, run attempt, argument fingerprint)."""
+
+    agent_id = event_data.get("agent_id")
+    agent_key = event_data.get("agent_key")
+    fingerprint = event_data.get("source_fingerprint")
+    if isinstance(agent_id, str) and agent_id:
+        agent_identifier = agent_id
+    elif isinstance(agent_key, str) and agent_key:
+        agent_identifier = agent_key
+    elif isinstance(fingerprint, str) and fingerprint:
+        agent_identifier = fingerprint
+    else:
+        agent_identifier = ""
+
+    args_repr = _normalise_tool_args(event_data.get("tool_args"))
+
+    run_attempts = event_data.get("run_attempts")
+    if run_attempts in (None, "", 0):
+        attempt_repr = "1"
+    else:
+        attempt_repr = str(run_attempts)
+
+    return (
+        agent_identifier,
+        attempt_repr,
+        args_repr,
+    )
+
+
+@dataclass(slots=True)
+class ListenerEvent:
+    """One event handed from the crew thread to the dashboard."""
+
+    run_id: str
+    type: str
+    source: str
+    event: Dict[str, Any]
+    # Display-ready form of the event, filled in by the consumer on receipt.
+    rendered: Optional[Dict[str, Any]] = None
+    # Set for tool events so the consumer can match invocations without
+    # re-serialising their arguments on the UI thread.
+    signature: Optional[ToolSignature] = None
+
+
+class EventChannel:
+    """Single-producer/single-consumer hand-off from the crew thread to the UI.
+
+    ``deque.append``/``popleft`` are atomic under the GIL, so payloads move
+    without taking a lock; the event only wakes a consumer waiting for data.
+    The buffer is a ring: once ``maxlen`` payloads are waiting, each new one
+    evicts the oldest and bumps a drop counter the consumer can report.
+    ``maxlen`` defaults to ``LISTENER_QUEUE_MAXSIZE`` (or 4096).
+    """
+
+    def __init__(self, maxlen: Optional[int] = None) -> None:
+        if maxlen is None:
+            maxlen = int(os.environ.get("LISTENER_QUEUE_MAXSIZE", MAX_BUFFERED_EVENTS))
+        self._maxlen = max(1, maxlen)
+        self._buffer: Deque[Any] = deque(maxlen=self._maxlen)
+        self._dropped = 0
+        self._wakeup = threading.Event()
+        self._attached = threading.Event()
+        self._last_drain = time.monotonic()
+
+    def attach(self) -> None:
+        """Mark the channel as consumed; producers skip work until this is called."""
+
+        self._last_drain = time.monotonic()
+        self._attached.set()
+
+    def detach(self) -> None:
+        self._attached.clear()
+
+    def has_consumer(self) -> bool:
+        """Whether a consumer is attached and has drained the channel recently."""
+
+        return self._attached.is_set() and time.monotonic() - self._last_drain < CONSUMER_TIMEOUT
+
+    def put(self, payload: Any) -> None:
+        if len(self._buffer) >= self._maxlen:
+            self._dropped += 1
+        self._buffer.append(payload)
+        self._notify()
+
+    def extend(self, payloads: Collection[Any]) -> None:
+        overflow = len(self._buffer) + len(payloads) - self._maxlen
+        if overflow > 0:
+            self._dropped += overflow
+        self._buffer.extend(payloads)
+        self._notify()
+
+    def take_dropped(self) -> int:
+        """Return how many payloads were evicted since the last call, and reset."""
+
+        dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    def _notify(self) -> None:
+        # Event.set() takes the condition lock and notifies waiters even when
+        # the flag is already up; is_set() is a plain attribute read. Skipping
+        # the redundant set is safe because drain() clears the flag *before*
+        # popping, so anything appended before this check is still drained.
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def drain(self) -> List[Any]:
+        """Remove and return every payload currently buffered, oldest first."""
+
+        self._last_drain = time.monotonic()
+        self._wakeup.clear()
+        # Snapshot the length once and pop exactly that many: the producer can
+        # only grow the buffer (or evict from the left while it is full, which
+        # keeps the length constant), so every popleft() is guaranteed to hit.
+        # Anything appended meanwhile is left for the next drain.
+        popleft = self._buffer.popleft
+        return [popleft() for _ in range(len(self._buffer))]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until a payload arrives or ``timeout`` elapses."""
+
+        return self._wakeup.wait(timeout)
+
 
 class StreamlitCrewListener(BaseEventListener):
-    """Feeds CrewAI lifecycle events into a thread-safe queue for visualization."""
+    """Feeds CrewAI lifecycle events into an :class:`EventChannel` for visualization.
+
+    Events are buffered and handed to the channel in batches, which wakes the
+    consumer once per batch instead of once per event. Call :meth:`close` once
+    the crew has finished to hand over anything still buffered.
+    """
 
-    def __init__(self, run_id: str, event_queue: Queue):
+    def __init__(self, run_id: str, channel: EventChannel):
         self._run_id = run_id
-        self._queue = event_queue
+        self._channel = channel
+        self._exclude = EXCLUDED_FIELDS
+        self._pending: Deque[ListenerEvent] = deque()
+        self._pending_lock = threading.Lock()
+        self._pending_tool_starts: Dict[Tuple[Any, ...], Tuple[ListenerEvent, float]] = {}
+        self._closed = threading.Event()
+        # Identifier lookups keyed by ``id(obj)``. The object itself is kept in
+        # the entry so a recycled id can never return another object's info.
+        self._task_info_cache: Dict[int, tuple[Any, Optional[str], Optional[str]]] = {}
+        self._agent_info_cache: Dict[int, tuple[Any, Optional[str], Optional[str]]] = {}
+        self._source_formatters: Dict[type, Callable[[Any], str]] = {}
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name=f"crew-listener-{run_id}",
+            daemon=True,
+        )
         super().__init__()
+        self._flusher.start()
+
+    def flush(self) -> None:
+        """Hand every buffered payload to the channel as a single batch."""
+
+        with self._pending_lock:
+            if not self._pending:
+                return
+            self._channel.extend(self._pending)
+            self._pending.clear()
+            self._pending_tool_starts.clear()
+
+    def close(self) -> None:
+        """Stop the background flusher and flush the remaining payloads."""
+
+        self._closed.set()
+        self.flush()
 
     def setup_listeners(self, crewai_event_bus) -> None:
         crewai_event_bus.on(CrewKickoffStartedEvent)(self._build_handler("crew:kickoff-started"))
@@ -67,29 +380,89 @@ class StreamlitCrewListener(BaseEventListener):
     # ---------------------------------------------------------------------
 
     def _build_handler(self, event_type: str):
+        # Everything that does not depend on the event is computed once per
+        # event type; each payload only adds its source and event data.
+        event_type = sys.intern(event_type)
+        run_id = self._run_id
+        flush_now = event_type in _FLUSH_IMMEDIATELY
+        is_tool_event = event_type.startswith("tool:")
+
         def handler(source: Any, event: Any) -> None:
+            if not self._channel.has_consumer():
+                return
             try:
-                payload = {
-                    "run_id": self._run_id,
-                    "type": event_type,
-                    "source": self._describe_source(source),
-                    "event": self._enrich_event(event, self._serialise_event(event)),
-                }
+                payload = ListenerEvent(
+                    run_id,
+                    event_type,
+                    self._describe_source(source),
+                    self._enrich_event(event, self._serialise_event(event)),
+                )
+                if is_tool_event:
+                    payload.signature = tool_signature(payload.event)
             except Exception as exc:  # pragma: no cover - defensive guard
-                payload = {
-                    "run_id": self._run_id,
-                    "type": "listener:error",
-                    "source": self._describe_source(source),
-                    "event": {
+                payload = ListenerEvent(
+                    run_id,
+                    "listener:error",
+                    self._describe_source(source),
+                    {
                         "error": repr(exc),
                         "event_type": type(event).__name__,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": utc_isoformat(),
                     },
-                }
-            self._queue.put(payload)
+                )
+            self._enqueue(payload, flush=flush_now)
 
         return handler
 
+    def _enqueue(self, payload: ListenerEvent, *, flush: bool = False) -> None:
+        with self._pending_lock:
+            if not self._coalesce_tool_event(payload):
+                self._pending.append(payload)
+            # Once closed, no flusher thread is left to pick up a short batch.
+            flush = flush or len(self._pending) >= BATCH_SIZE or self._closed.is_set()
+        if flush:
+            self.flush()
+
+    def _coalesce_tool_event(self, payload: ListenerEvent) -> bool:
+        """Fold a fast ``tool:finished`` into its buffered ``tool:started``.
+
+        Returns ``True`` when ``payload`` was merged and must not be buffered.
+        Must be called with ``_pending_lock`` held.
+        """
+
+        if payload.type == "tool:started":
+            self._pending_tool_starts[self._tool_invocation_key(payload.event)] = (payload, time.monotonic())
+            return False
+        if payload.type != "tool:finished":
+            return False
+
+        started = self._pending_tool_starts.pop(self._tool_invocation_key(payload.event), None)
+        if started is None:
+            return False
+
+        started_payload, started_at = started
+        elapsed = time.monotonic() - started_at
+        if elapsed > TOOL_COALESCE_WINDOW:
+            return False
+
+        started_payload.type = "tool:completed"
+        started_payload.event = {**payload.event, "duration_ms": round(elapsed * 1000, 3)}
+        started_payload.signature = payload.signature
+        return True
+
+    @staticmethod
+    def _tool_invocation_key(data: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            data.get("agent_key") or data.get("agent_id"),
+            data.get("tool_name"),
+            repr(data.get("tool_args")),
+            data.get("run_attempts"),
+        )
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(BATCH_INTERVAL):
+            self.flush()
+
     def _enrich_event(self, event: Any, data: Dict[str, Any]) -> Dict[str, Any]:
         """Attach lightweight identifiers that survive exclusion filters."""
 
@@ -97,8 +470,7 @@ class StreamlitCrewListener(BaseEventListener):
 
         task = getattr(event, "task", None)
         if task:
-            task_id = self._get_task_identifier(task)
-            task_name = self._get_task_name(task)
+            task_id, task_name = self._get_task_info(task)
             if task_id:
                 enriched.setdefault("task_id", task_id)
             if task_name:
@@ -106,7 +478,7 @@ class StreamlitCrewListener(BaseEventListener):
 
         agent = getattr(event, "agent", None)
         if agent:
-            agent_id, agent_role = self._get_agent_identifiers(agent)
+            agent_id, agent_role = self._get_agent_info(agent)
             if agent_id:
                 enriched.setdefault("agent_id", agent_id)
             if agent_role:
@@ -114,6 +486,25 @@ class StreamlitCrewListener(BaseEventListener):
 
         return enriched
 
+    def _get_task_info(self, task: Any) -> tuple[Optional[str], Optional[str]]:
+        cached = self._task_info_cache.get(id(task))
+        if cached is not None and cached[0] is task:
+            return cached[1], cached[2]
+
+        task_id = self._get_task_identifier(task)
+        task_name = self._get_task_name(task)
+        self._task_info_cache[id(task)] = (task, task_id, task_name)
+        return task_id, task_name
+
+    def _get_agent_info(self, agent: Any) -> tuple[Optional[str], Optional[str]]:
+        cached = self._agent_info_cache.get(id(agent))
+        if cached is not None and cached[0] is agent:
+            return cached[1], cached[2]
+
+        agent_id, agent_role = self._get_agent_identifiers(agent)
+        self._agent_info_cache[id(agent)] = (agent, agent_id, agent_role)
+        return agent_id, agent_role
+
     def _get_task_identifier(self, task: Any) -> Optional[str]:
         for attr in ("id", "task_id", "name"):
             value = getattr(task, attr, None)
@@ -152,7 +543,13 @@ class StreamlitCrewListener(BaseEventListener):
         return agent_id, agent_role
 
     def _serialise_event(self, event: Any) -> Dict[str, Any]:
-        exclude = EXCLUDED_FIELDS
+        extractor = _EVENT_EXTRACTORS.get(type(event))
+        if extractor is not None:
+            data = extractor(event)
+            data["event_type"] = type(event).__name__
+            return data
+
+        exclude = self._exclude
         if hasattr(event, "to_json"):
             try:
                 data = event.to_json(exclude=exclude)
@@ -171,11 +568,27 @@ class StreamlitCrewListener(BaseEventListener):
         }
 
     def _describe_source(self, source: Any) -> str:
+        source_type = type(source)
         try:
-            if hasattr(source, "role") and source.role:
-                return f"{type(source).__name__}({source.role})"
-            if hasattr(source, "name") and source.name:
-                return f"{type(source).__name__}({source.name})"
+            formatter = self._source_formatters.get(source_type)
+            if formatter is None:
+                formatter = self._source_formatters[source_type] = self._build_source_formatter(source)
+            return formatter(source)
         except Exception:
-            pass
-        return type(source).__name__
+            return source_type.__name__
+
+    @staticmethod
+    def _build_source_formatter(source: Any) -> Callable[[Any], str]:
+        """Inspect a source type once and return a formatter for its instances."""
+
+        type_name = type(source).__name__
+        attrs = tuple(attr for attr in ("role", "name") if hasattr(source, attr))
+
+        def describe(instance: Any) -> str:
+            for attr in attrs:
+                value = getattr(instance, attr, None)
+                if value:
+                    return f"{type_name}({value})"
+            return type_name
+
+        return describe
@@ -1,7 +1,7 @@
 from crewai import Crew
 from textwrap import dedent
 
-from agents import StockAnalysisAgents
+from agents import make_agents
 from tasks import StockAnalysisTasks
 
 from dotenv import load_dotenv
@@ -14,7 +14,7 @@ class FinancialCrew:
         self.company = company
 
     def run(self):
-        agents = StockAnalysisAgents()
+        agents = make_agents()
         tasks = StockAnalysisTasks()
 
         research_analyst_agent = agents.research_analyst()
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
-import json
 import os
 import time
 import uuid
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from queue import Empty, Queue
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 import html
-import re
 
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
@@ -18,8 +17,16 @@ from dotenv import load_dotenv
 
 from crewai.events import crewai_event_bus
 
-from listeners import StreamlitCrewListener
+from listeners import (
+    EventChannel,
+    ListenerEvent,
+    StreamlitCrewListener,
+    ToolSignature,
+    tool_signature,
+    utc_isoformat,
+)
 from main import FinancialCrew
+from think_sections import split_text_with_think_sections
 
 load_dotenv()
 
@@ -30,9 +37,21 @@ st.set_page_config(
 )
 
 
-EXECUTOR = ThreadPoolExecutor(max_workers=1)
 EXPECTED_TASKS = 4
-THINK_PATTERN = re.compile(r"<think>(.*?)</think>", re.IGNORECASE | re.DOTALL)
+MIN_RERUN_INTERVAL = 1 / 60
+# While a run is live the page reruns as soon as the crew posts events, at most
+# once per POLL_MIN_MS. Without events it still refreshes, backing off
+# exponentially to once per POLL_MAX_MS while the crew is quiet.
+POLL_MIN_INTERVAL = max(MIN_RERUN_INTERVAL, int(os.environ.get("POLL_MIN_MS", "50")) / 1000)
+POLL_MAX_INTERVAL = max(POLL_MIN_INTERVAL, int(os.environ.get("POLL_MAX_MS", "1000")) / 1000)
+# The feed keeps only the most recent events; older ones are dropped from the UI.
+EVENT_FEED_LIMIT = max(1, int(os.environ.get("EVENT_FEED_LIMIT", "500")))
+_STATUS_BADGES = {
+    "idle": "grey",
+    "running": "orange",
+    "completed": "green",
+    "failed": "red",
+}
 STATUS_STYLES = {
     "pending": ("🕓", "#9ca3af"),
     "running": ("🟡", "#f59e0b"),
@@ -40,6 +59,178 @@ STATUS_STYLES = {
     "failed": ("❌", "#ef4444"),
 }
 
+_EVENT_LABELS = {
+    "crew:kickoff-started": "Crew kickoff started",
+    "crew:kickoff-completed": "Crew kickoff completed",
+    "crew:kickoff-failed": "Crew kickoff failed",
+    "task:started": "Task started",
+    "task:completed": "Task completed",
+    "task:failed": "Task failed",
+    "agent:started": "Agent execution started",
+    "agent:completed": "Agent execution completed",
+    "agent:error": "Agent execution error",
+    "tool:started": "Tool started",
+    "tool:finished": "Tool finished",
+    "tool:completed": "Tool completed",
+    "tool:error": "Tool error",
+    "run:completed": "Run completed",
+    "run:failed": "Run failed",
+    "listener:overflow": "Events dropped (queue full)",
+}
+_FEED_HIGHLIGHT_KEYS = (
+    "crew_name",
+    "crew_id",
+    "agent_role",
+    "task_name",
+    "task_id",
+    "tool_name",
+    "status",
+)
+
+_TASK_STATUS_LOOKUP = {
+    "task:started": "running",
+    "task:completed": "completed",
+    "task:failed": "failed",
+}
+_AGENT_STATUS_LOOKUP = {
+    "agent:started": "running",
+    "agent:completed": "completed",
+    "agent:error": "failed",
+}
+_TOOL_STATUS_LOOKUP = {
+    "tool:started": "running",
+    "tool:finished": "completed",
+    "tool:completed": "completed",
+    "tool:error": "failed",
+}
+_ACTIVE_TOOL_STATES = frozenset({"pending", "running"})
+_TOOL_OUTPUT_EVENTS = frozenset({"tool:finished", "tool:completed"})
+_TERMINAL_TOOL_EVENTS = _TOOL_OUTPUT_EVENTS | {"tool:error"}
+_HISTORY_SKIP_KEYS = frozenset({"timestamp", "output"})
+# Per-entry event history is a debugging aid the UI never renders; it is only
+# collected when RECORD_EVENT_HISTORY is set, and capped per entry.
+RECORD_EVENT_HISTORY = os.environ.get("RECORD_EVENT_HISTORY", "").lower() in {"1", "true", "yes"}
+HISTORY_LIMIT = 200
+
+# Attributes an agent event can be matched on, in lookup priority order.
+_AGENT_INDEX_ATTRS = ("agent_id", "source_fingerprint", "agent_role")
+
+# Header markup for the agent timeline. Each registry entry caches its
+# rendered header and only rebuilds it after its status or label changes.
+_TASK_HEADER_TMPL = (
+    "<div style='margin-bottom:0.5rem;'>"
+    "<div><strong>{icon} Task: {name}</strong></div>"
+    "<div style='margin-left:1.2rem;color:{color};font-size:0.85rem;'>Status: {status}</div>"
+    "</div>"
+)
+_AGENT_HEADER_TMPL = (
+    "<div style='margin-left:1.2rem;margin-bottom:0.25rem;'>"
+    "<div><strong>{icon} Agent: {name}</strong></div>"
+    "<div style='margin-left:1.2rem;color:{color};font-size:0.8rem;'>Status: {status}</div>"
+    "</div>"
+)
+_TOOL_HEADER_TMPL = (
+    "<div style='margin-left:2.4rem;margin-bottom:0.15rem;'>"
+    "<div>{icon} {name}"
+    "<span style='color:{color};font-size:0.75rem;margin-left:0.5rem;'>{status}</span></div>"
+    "</div>"
+)
+
+_AWAITING_AGENTS_HTML = (
+    "<div style='margin-left:1.2rem;color:#9ca3af;font-size:0.85rem;'>Awaiting agent activity…</div>"
+)
+_AGENT_ERROR_TMPL = "<div style='margin-left:2.4rem;color:#ef4444;font-size:0.85rem;'>Error: {error}</div>"
+_TOOL_ERROR_HTML = (
+    "<div style='margin-left:3.2rem;color:#ef4444;font-size:0.75rem;margin-bottom:0.2rem;'>Error encountered</div>"
+)
+
+
+# A timeline element: ("markup", html) or ("details", summary, text).
+RenderOp = Tuple[Any, ...]
+
+
+# Registry entries are read and written on every event, so they are slotted
+# dataclasses rather than dicts. Streamlit re-executes this module on every
+# rerun, which redefines these classes: compare entries by attribute, never
+# with isinstance().
+@dataclass(slots=True)
+class ToolEntry:
+    """One tool invocation made by an agent."""
+
+    key: str
+    # (agent identifier, run attempt, argument fingerprint)
+    signature: ToolSignature
+    # Creation order within the agent; lookups prefer the earliest match.
+    sequence: int = 0
+    name: str = "Tool"
+    status: str = "pending"
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    output: Any = None
+    error: Any = None
+    first_seen: Optional[str] = None
+    last_event: Optional[str] = None
+    last_updated: Optional[str] = None
+    history: Optional[Deque[Dict[str, Any]]] = None
+    header_html: Optional[str] = None
+    header_dirty: bool = True
+
+
+@dataclass(slots=True)
+class AgentEntry:
+    """One agent's run within a task, with the tools it called."""
+
+    run_key: str
+    task_id: str
+    agent_id: Optional[str] = None
+    agent_role: str = "Agent"
+    source_fingerprint: Optional[str] = None
+    status: str = "pending"
+    output: Any = None
+    error: Any = None
+    output_fragments: List[Any] = field(default_factory=list)
+    # Last output fragment and its stripped form, see _merge_agent_output.
+    last_fragment_stripped: Optional[Tuple[str, str]] = None
+    tools: Dict[str, ToolEntry] = field(default_factory=dict)
+    tool_sequence: int = 0
+    # Tool lookups: running invocations by signature, every invocation by
+    # signature, and pending/running ones by name and by (agent, arguments).
+    # The last three map each key to {tool key: sequence}.
+    tool_active_map: Dict[ToolSignature, str] = field(default_factory=dict)
+    tool_by_signature: Dict[ToolSignature, Dict[str, int]] = field(default_factory=dict)
+    tool_by_name_active: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    tool_by_agentargs_active: Dict[Tuple[str, str], Dict[str, int]] = field(default_factory=dict)
+    first_seen: Optional[str] = None
+    last_event: Optional[str] = None
+    last_updated: Optional[str] = None
+    history: Optional[Deque[Dict[str, Any]]] = None
+    header_html: Optional[str] = None
+    header_dirty: bool = True
+
+
+@dataclass(slots=True)
+class TaskEntry:
+    """One crew task and the agent runs working on it."""
+
+    task_id: str
+    name: str
+    status: str = "pending"
+    agents: Dict[str, AgentEntry] = field(default_factory=dict)
+    first_seen: Optional[str] = None
+    last_event: Optional[str] = None
+    last_updated: Optional[str] = None
+    history: Optional[Deque[Dict[str, Any]]] = None
+    header_html: Optional[str] = None
+    header_dirty: bool = True
+    # Bumped on every event touching the task or its agents and tools; the
+    # timeline's render plan is rebuilt only when this moves on.
+    version: int = 0
+    render_plan: Optional[List[RenderOp]] = None
+    render_version: int = -1
+
+
+RegistryEntry = Union[TaskEntry, AgentEntry, ToolEntry]
+
 
 def _normalise_alias(value: Any) -> Optional[str]:
     if isinstance(value, str):
@@ -49,29 +240,61 @@ def _normalise_alias(value: Any) -> Optional[str]:
     return None
 
 
-def _merge_agent_output(entry: Dict[str, Any], new_output: Any) -> None:
+def _collect_aliases(*values: Any) -> List[str]:
+    """Return the non-blank strings among ``values``, stripped, in order."""
+
+    aliases: List[str] = []
+    append = aliases.append
+    for value in values:
+        if isinstance(value, str):
+            stripped = value.strip()
+            if stripped:
+                append(stripped)
+    return aliases
+
+
+def _merge_agent_output(entry: AgentEntry, new_output: Any) -> None:
     if new_output in (None, ""):
         return
 
-    fragments: List[Any] = entry.setdefault("output_fragments", [])
+    fragments = entry.output_fragments
 
     if fragments:
         last_fragment = fragments[-1]
         if last_fragment == new_output:
-            entry["output"] = _serialise_agent_output(fragments)
+            entry.output = _serialise_agent_output(fragments)
             return
 
         if isinstance(last_fragment, str) and isinstance(new_output, str):
-            if new_output.strip() and new_output.strip() in last_fragment:
-                entry["output"] = _serialise_agent_output(fragments)
+            # A substring can't be longer than the text it is searched in, so
+            # the length checks skip most ``in`` scans outright; streamed
+            # outputs usually just extend the last fragment, which
+            # ``startswith`` confirms without a full substring search.
+            new_stripped = new_output.strip()
+            if new_stripped and len(new_stripped) <= len(last_fragment) and new_stripped in last_fragment:
+                entry.output = _serialise_agent_output(fragments)
                 return
-            if last_fragment.strip() and last_fragment.strip() in new_output:
+            last_stripped = _last_fragment_stripped(entry, last_fragment)
+            if last_stripped and (
+                new_output.startswith(last_fragment)
+                or (len(last_stripped) <= len(new_output) and last_stripped in new_output)
+            ):
                 fragments[-1] = new_output
-                entry["output"] = _serialise_agent_output(fragments)
+                entry.last_fragment_stripped = (new_output, new_stripped)
+                entry.output = _serialise_agent_output(fragments)
                 return
 
     fragments.append(new_output)
-    entry["output"] = _serialise_agent_output(fragments)
+    entry.output = _serialise_agent_output(fragments)
+
+
+def _last_fragment_stripped(entry: AgentEntry, last_fragment: str) -> str:
+    cached = entry.last_fragment_stripped
+    if cached is not None and cached[0] is last_fragment:
+        return cached[1]
+    stripped = last_fragment.strip()
+    entry.last_fragment_stripped = (last_fragment, stripped)
+    return stripped
 
 
 def _serialise_agent_output(fragments: List[Any]) -> Any:
@@ -85,31 +308,15 @@ def _status_visual(status: str) -> tuple[str, str]:
     return STATUS_STYLES.get(status, ("⚪", "#9ca3af"))
 
 
-def _split_text_with_think_sections(text: str) -> List[Tuple[str, str]]:
-    if not text:
-        return []
-
-    segments: List[Tuple[str, str]] = []
-    last_index = 0
-
-    for match in THINK_PATTERN.finditer(text):
-        normal_segment = text[last_index: match.start()]
-        if normal_segment.strip():
-            segments.append(("markdown", normal_segment))
-
-        think_content = match.group(1).strip()
-        if think_content:
-            segments.append(("think", think_content))
-        last_index = match.end()
-
-    remainder = text[last_index:]
-    if remainder.strip():
-        segments.append(("markdown", remainder))
-
-    if not segments:
-        segments.append(("markdown", text))
-
-    return segments
+def _header_html(entry: RegistryEntry, template: str, label: str) -> str:
+    header = entry.header_html
+    if header is None or entry.header_dirty:
+        status = entry.status
+        icon, color = _status_visual(status)
+        header = template.format(icon=icon, color=color, status=status.title(), name=html.escape(label))
+        entry.header_html = header
+        entry.header_dirty = False
+    return header
 
 
 def _render_text_with_think_sections(
@@ -123,7 +330,7 @@ def _render_text_with_think_sections(
         return
 
     render_target = target or st
-    segments = _split_text_with_think_sections(text)
+    segments = split_text_with_think_sections(text)
 
     think_counter = 0
     for kind, content in segments:
@@ -168,242 +375,295 @@ def _render_details(
         )
 
 
-def _normalise_tool_args(args: Any) -> str:
-    if args is None:
-        return ""
-    if isinstance(args, str):
-        stripped = args.strip()
-        if not stripped:
-            return ""
-        try:
-            parsed = json.loads(stripped)
-        except json.JSONDecodeError:
-            return stripped
-        else:
-            args = parsed
-    try:
-        return json.dumps(args, sort_keys=True, default=str)
-    except TypeError:
-        return repr(args)
-
-
-def _tool_signature(event_data: Dict[str, Any]) -> tuple:
-    agent_identifier = next(
-        (
-            value
-            for value in (
-                event_data.get("agent_id"),
-                event_data.get("agent_key"),
-                event_data.get("source_fingerprint"),
-            )
-            if isinstance(value, str) and value
-        ),
-        "",
-    )
+def _find_matching_tool_entry(
+    agent_entry: AgentEntry, signature: ToolSignature, event_data: Dict[str, Any]
+) -> Optional[ToolEntry]:
+    # Each index may hold several tools; like a scan of ``tools`` in
+    # insertion order, the earliest one created wins.
+    keys = agent_entry.tool_by_signature.get(signature)
+    if keys:
+        return agent_entry.tools[min(keys, key=keys.__getitem__)]
 
-    args_repr = _normalise_tool_args(event_data.get("tool_args"))
+    # Fallback: match by tool name for an active (non-terminal) entry
+    name = event_data.get("tool_name") or ""
+    keys = agent_entry.tool_by_name_active.get(name)
+    if keys:
+        return agent_entry.tools[min(keys, key=keys.__getitem__)]
 
-    run_attempts = event_data.get("run_attempts")
-    if run_attempts in (None, "", 0):
-        attempt_repr = "1"
-    else:
-        attempt_repr = str(run_attempts)
+    agent_identifier, _, args_repr = signature
+    keys = agent_entry.tool_by_agentargs_active.get((agent_identifier, args_repr))
+    if keys:
+        return agent_entry.tools[min(keys, key=keys.__getitem__)]
 
-    return (
-        agent_identifier,
-        attempt_repr,
-        args_repr,
-    )
+    return None
 
 
-def _find_matching_tool_entry(
-    tools: Dict[str, Dict[str, Any]], signature: tuple, event_data: Dict[str, Any]
-) -> tuple[Optional[str], Optional[Dict[str, Any]]]:
-    for key, entry in tools.items():
-        if entry.get("signature") == signature:
-            return key, entry
+def _index_tool(agent_entry: AgentEntry, tool_entry: ToolEntry) -> None:
+    """Register a tool entry in the lookup indices used by _find_matching_tool_entry."""
 
-    # Fallback: match by tool name for an active (non-terminal) entry
-    name = event_data.get("tool_name") or ""
-    for key, entry in tools.items():
-        if entry.get("name") == name and entry.get("status") in {"pending", "running"}:
-            return key, entry
-    agent_identifier, _, args_repr = signature
-    for key, entry in tools.items():
-        if (
-            entry.get("agent_identifier") == agent_identifier
-            and entry.get("args_repr") == args_repr
-            and entry.get("status") in {"pending", "running"}
-        ):
-            return key, entry
+    tool_key = tool_entry.key
+    sequence = tool_entry.sequence
+    signature = tool_entry.signature
+    agent_entry.tool_by_signature.setdefault(signature, {})[tool_key] = sequence
+    if tool_entry.status in _ACTIVE_TOOL_STATES:
+        agent_entry.tool_by_name_active.setdefault(tool_entry.name, {})[tool_key] = sequence
+        agent_entry.tool_by_agentargs_active.setdefault((signature[0], signature[2]), {})[tool_key] = sequence
 
-    return None, None
+
+def _unindex_tool(agent_entry: AgentEntry, tool_key: str, name: str, signature: ToolSignature) -> None:
+    """Drop ``tool_key`` from the indices it was filed under as ``name``/``signature``."""
+
+    for index, index_key in (
+        (agent_entry.tool_by_signature, signature),
+        (agent_entry.tool_by_name_active, name),
+        (agent_entry.tool_by_agentargs_active, (signature[0], signature[2])),
+    ):
+        keys = index.get(index_key)
+        if keys is None:
+            continue
+        keys.pop(tool_key, None)
+        if not keys:
+            del index[index_key]
 
 
 def _init_session_state() -> None:
     defaults = {
         "run_id": None,
         "status": "idle",
-        "events": [],
+        "events": deque(maxlen=EVENT_FEED_LIMIT),
+        "events_seen": 0,
         "completed_tasks": set(),
         "task_registry": {},
         "agent_registry": {},
         "task_alias_map": {},
         "agent_alias_map": {},
-        "event_queue": None,
+        "agent_by_task": {},
+        "event_channel": None,
         "crew_future": None,
         "future_processed": False,
         "final_output": None,
         "errors": [],
+        "render_version": 0,
+        "timeline_order": None,
     }
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
 
 
+# CrewAI's event bus is process-global and ``scoped_handlers`` swaps its handlers
+# for the whole process, so crews sharing an interpreter see each other's events.
+# Keep one worker unless runs are known not to overlap.
+@st.cache_resource
+def _crew_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor; cached so every rerun and session shares it."""
+
+    return ThreadPoolExecutor(max_workers=max(1, int(os.environ.get("CREW_EXECUTOR_WORKERS", "1"))))
+
+
 def _start_run(company: str) -> None:
     run_id = str(uuid.uuid4())
-    event_queue: Queue = Queue()
+    previous_channel: Optional[EventChannel] = st.session_state.get("event_channel")
+    if previous_channel is not None:
+        previous_channel.detach()
+
+    event_channel = EventChannel()
+    event_channel.attach()
 
     st.session_state.update(
         {
             "run_id": run_id,
             "status": "running",
-            "events": [],
+            "events": deque(maxlen=EVENT_FEED_LIMIT),
+            "events_seen": 0,
             "completed_tasks": set(),
             "task_registry": {},
             "agent_registry": {},
             "task_alias_map": {},
             "agent_alias_map": {},
-            "event_queue": event_queue,
+            "agent_by_task": {},
+            "event_channel": event_channel,
             "final_output": None,
             "errors": [],
             "future_processed": False,
+            "idle_polls": 0,
+            "render_version": st.session_state.get("render_version", 0) + 1,
+            "timeline_order": None,
         }
     )
 
-    future = EXECUTOR.submit(_run_financial_crew, company, run_id, event_queue)
+    future = _crew_executor().submit(_run_financial_crew, company, run_id, event_channel)
     st.session_state["crew_future"] = future
 
 
-def _run_financial_crew(company: str, run_id: str, event_queue: Queue) -> None:
+def _run_financial_crew(company: str, run_id: str, event_channel: EventChannel) -> None:
     financial_crew = FinancialCrew(company)
     try:
         with crewai_event_bus.scoped_handlers():
-            StreamlitCrewListener(run_id=run_id, event_queue=event_queue)
-            result = financial_crew.run()
-
-        event_queue.put(
-            {
-                "run_id": run_id,
-                "type": "run:completed",
-                "source": "FinancialCrew",
-                "event": {"output": result, "timestamp": datetime.utcnow().isoformat()},
-            }
+            listener = StreamlitCrewListener(run_id=run_id, channel=event_channel)
+            try:
+                result = financial_crew.run()
+            finally:
+                listener.close()
+
+        event_channel.put(
+            ListenerEvent(
+                run_id=run_id,
+                type="run:completed",
+                source="FinancialCrew",
+                event={"output": result, "timestamp": utc_isoformat()},
+            )
         )
     except Exception as exc:  # pragma: no cover - surfaced in UI
-        event_queue.put(
-            {
-                "run_id": run_id,
-                "type": "run:failed",
-                "source": "FinancialCrew",
-                "event": {
+        event_channel.put(
+            ListenerEvent(
+                run_id=run_id,
+                type="run:failed",
+                source="FinancialCrew",
+                event={
                     "error": repr(exc),
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": utc_isoformat(),
                 },
-            }
+            )
         )
         raise
 
 
-def _drain_event_queue() -> None:
-    event_queue: Optional[Queue] = st.session_state.get("event_queue")
-    if event_queue is None:
-        return
+def _drain_event_queue() -> int:
+    """Process every buffered event and return how many there were."""
 
-    while True:
-        try:
-            payload = event_queue.get_nowait()
-        except Empty:
-            break
-        else:
-            _process_event(payload)
+    event_channel: Optional[EventChannel] = st.session_state.get("event_channel")
+    if event_channel is None:
+        return 0
+
+    payloads = event_channel.drain()
+    dropped = event_channel.take_dropped()
+    if dropped:
+        _process_event(
+            ListenerEvent(
+                run_id=st.session_state.get("run_id") or "",
+                type="listener:overflow",
+                source="EventChannel",
+                event={"dropped": dropped, "timestamp": utc_isoformat()},
+            )
+        )
+
+    for payload in payloads:
+        _process_event(payload)
+    drained = len(payloads) + bool(dropped)
+    if drained:
+        st.session_state["render_version"] += drained
+    return drained
+
+
+def _poll_interval(drained: int) -> float:
+    """Return the delay before the next refresh, doubling with each idle poll."""
+
+    state = st.session_state
+    idle_polls = 0 if drained else min(state.get("idle_polls", 0) + 1, 16)
+    state["idle_polls"] = idle_polls
+    return min(POLL_MAX_INTERVAL, POLL_MIN_INTERVAL * 2**idle_polls)
+
+
+def _wait_for_events(frame_started: float, timeout: float) -> None:
+    """Block until the crew posts events or ``timeout`` has passed since the frame began.
+
+    The channel's wakeup event cuts the wait short as soon as a batch lands,
+    but a frame always lasts at least POLL_MIN_INTERVAL so bursts share one
+    repaint. Time spent rendering counts towards both bounds.
+    """
 
+    event_channel: Optional[EventChannel] = st.session_state.get("event_channel")
+    remaining = timeout - (time.monotonic() - frame_started)
+    if event_channel is not None and remaining > 0:
+        event_channel.wait(remaining)
+    remaining = POLL_MIN_INTERVAL - (time.monotonic() - frame_started)
+    if remaining > 0:
+        time.sleep(remaining)
 
-def _process_event(payload: Dict[str, Any]) -> None:
-    if payload.get("run_id") != st.session_state.get("run_id"):
+
+def _process_event(payload: ListenerEvent) -> None:
+    state = st.session_state
+    if payload.run_id != state.get("run_id"):
         return
 
-    event_type = payload.get("type", "event:unknown")
-    event_data = payload.get("event", {})
+    event_type = payload.type or "event:unknown"
+    event_data = payload.event or {}
 
-    st.session_state["events"].append(payload)
+    payload.rendered = _prepare_feed_entry(event_type, event_data)
+    state["events"].append(payload)
+    state["events_seen"] += 1
 
     task_id, task_entry = _update_task_registry(event_type, event_data)
     if task_entry is None and task_id:
-        task_entry = st.session_state.get("task_registry", {}).get(task_id)
+        task_entry = state.get("task_registry", {}).get(task_id)
 
-    agent_entry = _update_agent_registry(event_type, event_data, task_id)
-    if agent_entry and task_entry is not None:
-        agents = task_entry.setdefault("agents", {})
-        agents[agent_entry["run_key"]] = agent_entry
+    agent_entry = _update_agent_registry(event_type, event_data, task_id, payload.signature)
+    if task_entry is not None:
+        task_entry.version += 1
+        if agent_entry is not None:
+            task_entry.agents[agent_entry.run_key] = agent_entry
 
-    if event_type == "task:completed":
-        key = task_id or (task_entry or {}).get("task_id")
-        if key:
-            st.session_state["completed_tasks"].add(key)
-        else:
-            st.session_state["completed_tasks"].add(event_type)
-    elif event_type == "run:completed":
-        st.session_state["status"] = "completed"
-        st.session_state["final_output"] = event_data.get("output")
-    elif event_type == "run:failed":
-        st.session_state["status"] = "failed"
-        st.session_state["errors"].append(event_data.get("error", "Unknown error"))
-
-
-def _update_task_registry(event_type: str, event_data: Dict[str, Any]) -> tuple[Optional[str], Optional[Dict[str, Any]]]:
-    tasks = st.session_state.setdefault("task_registry", {})
-    alias_map = st.session_state.setdefault("task_alias_map", {})
-
-    identifier_aliases = [
-        event_data.get("task_id"),
-        event_data.get("id"),
-    ]
-    name_aliases = [
-        event_data.get("name"),
-        event_data.get("task_name"),
-    ]
+    handler = _EVENT_HANDLERS.get(event_type)
+    if handler is not None:
+        handler(event_data, task_id, task_entry)
+
+
+def _on_task_completed(
+    event_data: Dict[str, Any], task_id: Optional[str], task_entry: Optional[TaskEntry]
+) -> None:
+    key = task_id or (task_entry.task_id if task_entry is not None else None)
+    st.session_state["completed_tasks"].add(key or "task:completed")
+
+
+def _on_run_completed(
+    event_data: Dict[str, Any], task_id: Optional[str], task_entry: Optional[TaskEntry]
+) -> None:
+    state = st.session_state
+    state["status"] = "completed"
+    state["final_output"] = event_data.get("output")
 
-    alias_candidates = [
-        value.strip()
-        for value in identifier_aliases + name_aliases
-        if isinstance(value, str) and value.strip()
-    ]
+
+def _on_run_failed(
+    event_data: Dict[str, Any], task_id: Optional[str], task_entry: Optional[TaskEntry]
+) -> None:
+    state = st.session_state
+    state["status"] = "failed"
+    state["errors"].append(event_data.get("error", "Unknown error"))
+
+
+_EventHandler = Callable[[Dict[str, Any], Optional[str], Optional[TaskEntry]], None]
+_EVENT_HANDLERS: Dict[str, _EventHandler] = {
+    "task:completed": _on_task_completed,
+    "run:completed": _on_run_completed,
+    "run:failed": _on_run_failed,
+}
+
+
+def _update_task_registry(event_type: str, event_data: Dict[str, Any]) -> tuple[Optional[str], Optional[TaskEntry]]:
+    state = st.session_state
+    tasks: Dict[str, TaskEntry] = state.setdefault("task_registry", {})
+    alias_map = state.setdefault("task_alias_map", {})
+
+    identifier_aliases = _collect_aliases(event_data.get("task_id"), event_data.get("id"))
+    name_aliases = _collect_aliases(event_data.get("name"), event_data.get("task_name"))
+    alias_candidates = identifier_aliases + name_aliases
 
     task_id: Optional[str] = None
 
     for alias in alias_candidates:
-        alias_key = _normalise_alias(alias)
-        if alias_key and alias_key in alias_map:
+        alias_key = alias.casefold()
+        if alias_key in alias_map:
             task_id = alias_map[alias_key]
             break
 
-    if task_id is None:
-        for alias in identifier_aliases:
-            if isinstance(alias, str) and alias.strip():
-                task_id = alias.strip()
-                break
+    if task_id is None and identifier_aliases:
+        task_id = identifier_aliases[0]
 
     if task_id is None and name_aliases:
-        normalised_names = {
-            _normalise_alias(name)
-            for name in name_aliases
-            if isinstance(name, str) and name.strip()
-        }
+        normalised_names = {name.casefold() for name in name_aliases}
         for existing_id, entry in tasks.items():
-            entry_name = entry.get("name") if isinstance(entry.get("name"), str) else None
-            entry_key = _normalise_alias(entry_name) if entry_name else None
+            entry_key = _normalise_alias(entry.name)
             if entry_key and entry_key in normalised_names:
                 task_id = existing_id
                 break
@@ -418,54 +678,43 @@ def _update_task_registry(event_type: str, event_data: Dict[str, Any]) -> tuple[
         task_id = uuid.uuid4().hex
 
     for alias in alias_candidates:
-        alias_key = _normalise_alias(alias)
-        if alias_key:
-            alias_map[alias_key] = task_id
+        alias_map[alias.casefold()] = task_id
 
-    entry = tasks.setdefault(
-        task_id,
-        {
-            "task_id": task_id,
-            "name": event_data.get("name") or event_data.get("task_name") or event_data.get("description") or task_id,
-            "status": "pending",
-            "history": [],
-            "agents": {},
-            "first_seen": event_data.get("timestamp"),
-        },
-    )
+    preferred_name = event_data.get("name") or event_data.get("task_name") or event_data.get("description")
+    entry = tasks.get(task_id)
+    if entry is None:
+        entry = tasks[task_id] = TaskEntry(
+            task_id=task_id,
+            name=preferred_name or task_id,
+            first_seen=event_data.get("timestamp"),
+        )
 
-    entry["task_id"] = task_id
+    header_state = (entry.status, entry.name)
 
-    preferred_name = event_data.get("name") or event_data.get("task_name") or event_data.get("description")
     if preferred_name:
-        entry["name"] = preferred_name
+        entry.name = preferred_name
 
-    status_lookup = {
-        "task:started": "running",
-        "task:completed": "completed",
-        "task:failed": "failed",
-    }
-    maybe_status = status_lookup.get(event_type)
+    maybe_status = _TASK_STATUS_LOOKUP.get(event_type)
     if maybe_status:
-        entry["status"] = maybe_status
+        entry.status = maybe_status
 
-    entry.setdefault("first_seen", event_data.get("timestamp"))
-    entry["last_event"] = event_type
-    entry["last_updated"] = event_data.get("timestamp")
+    if (entry.status, entry.name) != header_state:
+        entry.header_dirty = True
 
-    history_entry = {
-        "type": event_type,
-        "timestamp": event_data.get("timestamp"),
-        "summary": {k: v for k, v in event_data.items() if k not in {"timestamp", "output"}},
-    }
-    entry.setdefault("history", []).append(history_entry)
+    entry.last_event = event_type
+    entry.last_updated = event_data.get("timestamp")
+
+    _record_history(entry, event_type, event_data)
 
     return task_id, entry
 
 
 def _update_agent_registry(
-    event_type: str, event_data: Dict[str, Any], task_id: Optional[str]
-) -> Optional[Dict[str, Any]]:
+    event_type: str,
+    event_data: Dict[str, Any],
+    task_id: Optional[str],
+    signature: Optional[ToolSignature] = None,
+) -> Optional[AgentEntry]:
     if not event_type.startswith("agent:") and not event_type.startswith("tool:"):
         return None
 
@@ -473,123 +722,124 @@ def _update_agent_registry(
     if not task_id:
         return None
 
-    registry = st.session_state.setdefault("agent_registry", {})
-    alias_store = st.session_state.setdefault("agent_alias_map", {})
-    task_aliases = alias_store.setdefault(task_id, {})
-
-    alias_candidates = [
-        value.strip()
-        for value in (
-            event_data.get("source_fingerprint"),
-            event_data.get("agent_id"),
-            event_data.get("agent_key"),
-            event_data.get("agent_role"),
-        )
-        if isinstance(value, str) and value.strip()
-    ]
+    state = st.session_state
+    registry: Dict[str, AgentEntry] = state.setdefault("agent_registry", {})
+    task_aliases = state.setdefault("agent_alias_map", {}).setdefault(task_id, {})
+    task_index = state.setdefault("agent_by_task", {}).setdefault(task_id, {})
+
+    alias_candidates = _collect_aliases(
+        event_data.get("source_fingerprint"),
+        event_data.get("agent_id"),
+        event_data.get("agent_key"),
+        event_data.get("agent_role"),
+    )
 
     run_key: Optional[str] = None
-    entry: Optional[Dict[str, Any]] = None
+    entry: Optional[AgentEntry] = None
 
     for alias in alias_candidates:
-        alias_key = _normalise_alias(alias)
-        if not alias_key:
-            continue
-        candidate_key = task_aliases.get(alias_key)
+        candidate_key = task_aliases.get(alias.casefold())
         if candidate_key and candidate_key in registry:
             run_key = candidate_key
             entry = registry[candidate_key]
             break
 
     if run_key is None:
-        for candidate_key, candidate_entry in registry.items():
-            if candidate_entry.get("task_id") != task_id:
-                continue
-            if event_data.get("agent_id") and candidate_entry.get("agent_id") == event_data.get("agent_id"):
-                run_key = candidate_key
-                entry = candidate_entry
-                break
-            if event_data.get("source_fingerprint") and candidate_entry.get("source_fingerprint") == event_data.get("source_fingerprint"):
-                run_key = candidate_key
-                entry = candidate_entry
-                break
-            if event_data.get("agent_role") and candidate_entry.get("agent_role") == event_data.get("agent_role"):
+        for attr in _AGENT_INDEX_ATTRS:
+            value = event_data.get(attr)
+            candidate_key = task_index.get(attr, {}).get(value) if value else None
+            if candidate_key and candidate_key in registry:
                 run_key = candidate_key
-                entry = candidate_entry
+                entry = registry[candidate_key]
                 break
 
     if run_key is None:
-        task_candidates = [candidate_entry for candidate_entry in registry.values() if candidate_entry.get("task_id") == task_id]
-        if len(task_candidates) == 1:
-            candidate_entry = task_candidates[0]
-            candidate_run_key = candidate_entry.get("run_key")
-            if candidate_run_key:
-                entry = candidate_entry
-                run_key = candidate_run_key
+        task_runs = task_index.get("run_key", {})
+        if len(task_runs) == 1:
+            candidate_key = next(iter(task_runs))
+            if candidate_key in registry:
+                run_key = candidate_key
+                entry = registry[candidate_key]
 
     if run_key is None:
         run_key = _build_agent_run_key(task_id, event_data)
         entry = registry.get(run_key)
 
     if entry is None:
-        entry = {
-            "run_key": run_key,
-            "task_id": task_id,
-            "agent_id": event_data.get("agent_id"),
-            "agent_role": event_data.get("agent_role") or "Agent",
-            "status": "pending",
-            "history": [],
-            "tools": {},
-            "first_seen": event_data.get("timestamp"),
-            "source_fingerprint": event_data.get("source_fingerprint"),
-        }
-        registry[run_key] = entry
+        entry = registry[run_key] = AgentEntry(
+            run_key=run_key,
+            task_id=task_id,
+            agent_id=event_data.get("agent_id"),
+            agent_role=event_data.get("agent_role") or "Agent",
+            source_fingerprint=event_data.get("source_fingerprint"),
+            first_seen=event_data.get("timestamp"),
+        )
 
     for alias in alias_candidates:
-        alias_key = _normalise_alias(alias)
-        if alias_key:
-            task_aliases[alias_key] = run_key
+        task_aliases[alias.casefold()] = run_key
 
-    entry["run_key"] = run_key
-    entry["task_id"] = task_id
+    header_state = (entry.status, entry.agent_role)
+    indexed_values = (entry.agent_id, entry.source_fingerprint, entry.agent_role)
     if event_data.get("agent_role"):
-        entry["agent_role"] = event_data["agent_role"]
+        entry.agent_role = event_data["agent_role"]
     if event_data.get("agent_id"):
-        entry["agent_id"] = event_data["agent_id"]
+        entry.agent_id = event_data["agent_id"]
     if event_data.get("source_fingerprint"):
-        entry["source_fingerprint"] = event_data["source_fingerprint"]
+        entry.source_fingerprint = event_data["source_fingerprint"]
+    _index_agent(task_index, entry, indexed_values)
 
-    agent_status_lookup = {
-        "agent:started": "running",
-        "agent:completed": "completed",
-        "agent:error": "failed",
-    }
-    maybe_status = agent_status_lookup.get(event_type)
+    maybe_status = _AGENT_STATUS_LOOKUP.get(event_type)
     if maybe_status:
-        entry["status"] = maybe_status
+        entry.status = maybe_status
 
     if event_type == "agent:completed" and event_data.get("output"):
         _merge_agent_output(entry, event_data["output"])
     if event_type == "agent:error" and event_data.get("error"):
-        entry["error"] = event_data["error"]
+        entry.error = event_data["error"]
+    if (entry.status, entry.agent_role) != header_state:
+        entry.header_dirty = True
 
     if event_type.startswith("tool:"):
-        _update_tool_usage(entry, event_type, event_data)
+        _update_tool_usage(entry, event_type, event_data, signature)
 
-    entry.setdefault("first_seen", event_data.get("timestamp"))
-    entry["last_event"] = event_type
-    entry["last_updated"] = event_data.get("timestamp")
-    entry.setdefault("history", []).append(
-        {
-            "type": event_type,
-            "timestamp": event_data.get("timestamp"),
-            "summary": {k: v for k, v in event_data.items() if k not in {"timestamp", "output"}},
-        }
-    )
+    entry.last_event = event_type
+    entry.last_updated = event_data.get("timestamp")
+    _record_history(entry, event_type, event_data)
 
     return entry
 
 
+def _index_agent(
+    task_index: Dict[str, Dict[str, str]],
+    entry: AgentEntry,
+    previous_values: Tuple[Optional[str], ...],
+) -> None:
+    """Point the task's attribute indices at ``entry`` for its current values."""
+
+    run_key = entry.run_key
+    task_index.setdefault("run_key", {})[run_key] = run_key
+    current_values = (entry.agent_id, entry.source_fingerprint, entry.agent_role)
+    for attr, previous, current in zip(_AGENT_INDEX_ATTRS, previous_values, current_values):
+        attr_index = task_index.setdefault(attr, {})
+        if previous and previous != current and attr_index.get(previous) == run_key:
+            del attr_index[previous]
+        if current:
+            attr_index.setdefault(current, run_key)
+
+
+def _record_history(entry: RegistryEntry, event_type: str, event_data: Dict[str, Any]) -> None:
+    if not RECORD_EVENT_HISTORY:
+        return
+
+    history = entry.history
+    if history is None:
+        history = entry.history = deque(maxlen=HISTORY_LIMIT)
+    summary = event_data.copy()
+    for key in _HISTORY_SKIP_KEYS:
+        summary.pop(key, None)
+    history.append({"type": event_type, "timestamp": event_data.get("timestamp"), "summary": summary})
+
+
 def _build_agent_run_key(task_id: str, event_data: Dict[str, Any]) -> Optional[str]:
     candidates = [
         event_data.get("source_fingerprint"),
@@ -609,115 +859,88 @@ def _build_agent_run_key(task_id: str, event_data: Dict[str, Any]) -> Optional[s
     return f"{task_id}:{uuid.uuid4().hex}"
 
 
-def _update_tool_usage(agent_entry: Dict[str, Any], event_type: str, event_data: Dict[str, Any]) -> None:
-    tools = agent_entry.setdefault("tools", {})
-    active_map = agent_entry.setdefault("tool_active_map", {})
-    agent_entry.setdefault("tool_sequence", 0)
+def _update_tool_usage(
+    agent_entry: AgentEntry,
+    event_type: str,
+    event_data: Dict[str, Any],
+    signature: Optional[ToolSignature] = None,
+) -> None:
+    tools = agent_entry.tools
+    active_map = agent_entry.tool_active_map
 
-    signature = _tool_signature(event_data)
+    if signature is None:
+        signature = tool_signature(event_data)
 
     tool_key = active_map.get(signature)
-    tool_entry: Optional[Dict[str, Any]] = tools.get(tool_key) if tool_key else None
+    tool_entry = tools.get(tool_key) if tool_key else None
 
     if tool_entry is None:
-        tool_key, tool_entry = _find_matching_tool_entry(tools, signature, event_data)
+        tool_entry = _find_matching_tool_entry(agent_entry, signature, event_data)
 
     if tool_entry is None:
-        agent_entry["tool_sequence"] += 1
-        tool_key = f"tool-{agent_entry['tool_sequence']}"
-        tool_entry = tools.setdefault(
-            tool_key,
-            {
-                "key": tool_key,
-                "signature": signature,
-                "name": event_data.get("tool_name")
-                or (
-                    str(event_data.get("tool_class"))
-                    if event_data.get("tool_class") and event_type == "tool:started"
-                    else "Tool"
-                ),
-                "status": "pending",
-                "started_at": event_data.get("timestamp"),
-                "completed_at": None,
-                "output": None,
-                "error": None,
-                "first_seen": event_data.get("timestamp"),
-                "history": [],
-                "agent_identifier": signature[0],
-                "args_repr": signature[2],
-                "run_attempt": signature[1],
-            },
+        agent_entry.tool_sequence += 1
+        tool_key = f"tool-{agent_entry.tool_sequence}"
+        tool_entry = tools[tool_key] = ToolEntry(
+            key=tool_key,
+            signature=signature,
+            sequence=agent_entry.tool_sequence,
+            name=event_data.get("tool_name")
+            or (
+                str(event_data.get("tool_class"))
+                if event_data.get("tool_class") and event_type == "tool:started"
+                else "Tool"
+            ),
+            started_at=event_data.get("timestamp"),
+            first_seen=event_data.get("timestamp"),
         )
+        indexed_state = None
     else:
-        resolved_key = tool_entry.setdefault("key", tool_key or _build_tool_key(event_data))
-        tool_key = resolved_key
-        tool_entry.setdefault("history", [])
-        tool_entry.setdefault("first_seen", event_data.get("timestamp"))
-        tool_entry.setdefault("agent_identifier", signature[0])
-        tool_entry.setdefault("args_repr", signature[2])
-        tool_entry.setdefault("run_attempt", signature[1])
+        tool_key = tool_entry.key
+        indexed_state = (tool_entry.status, tool_entry.name, tool_entry.signature)
 
-    if tool_entry is None:
-        return
-
-    tool_entry = cast(Dict[str, Any], tool_entry)
+    header_state = (tool_entry.status, tool_entry.name)
 
     # Update mapping for active tool runs when we receive a start event
-    if event_type == "tool:started" and tool_key is not None:
+    if event_type == "tool:started":
         active_map[signature] = tool_key
 
-    tool_entry["signature"] = signature
-    tool_entry["agent_identifier"] = signature[0]
-    tool_entry["args_repr"] = signature[2]
-    tool_entry["run_attempt"] = signature[1]
+    tool_entry.signature = signature
 
     if event_data.get("tool_name"):
-        tool_entry["name"] = event_data["tool_name"]
+        tool_entry.name = event_data["tool_name"]
     elif event_type == "tool:started" and event_data.get("tool_class"):
-        tool_entry["name"] = str(event_data["tool_class"])
-    tool_entry.setdefault("name", "Tool")
+        tool_entry.name = str(event_data["tool_class"])
     if event_type == "tool:started":
-        tool_entry["started_at"] = event_data.get("timestamp")
-    if event_type in {"tool:finished", "tool:error"} and event_data.get("started_at"):
-        tool_entry.setdefault("started_at", event_data.get("started_at"))
-
-    status_lookup = {
-        "tool:started": "running",
-        "tool:finished": "completed",
-        "tool:error": "failed",
-    }
-    maybe_status = status_lookup.get(event_type)
+        tool_entry.started_at = event_data.get("timestamp")
+    if event_type in _TERMINAL_TOOL_EVENTS and event_data.get("started_at") and tool_entry.started_at is None:
+        tool_entry.started_at = event_data["started_at"]
+
+    maybe_status = _TOOL_STATUS_LOOKUP.get(event_type)
     if maybe_status:
-        tool_entry["status"] = maybe_status
+        tool_entry.status = maybe_status
 
-    if event_type == "tool:finished" and event_data.get("output") is not None:
-        tool_entry["output"] = event_data["output"]
-        tool_entry["completed_at"] = event_data.get("timestamp")
+    if event_type in _TOOL_OUTPUT_EVENTS and event_data.get("output") is not None:
+        tool_entry.output = event_data["output"]
+        tool_entry.completed_at = event_data.get("timestamp")
     if event_type == "tool:error" and event_data.get("error") is not None:
-        tool_entry["error"] = event_data["error"]
-        tool_entry["completed_at"] = event_data.get("timestamp")
-
-    tool_entry["last_event"] = event_type
-    tool_entry["last_updated"] = event_data.get("timestamp")
-    tool_entry.setdefault("history", []).append(
-        {
-            "type": event_type,
-            "timestamp": event_data.get("timestamp"),
-            "summary": {k: v for k, v in event_data.items() if k not in {"timestamp", "output"}},
-        }
-    )
-
-    if event_type in {"tool:finished", "tool:error"}:
+        tool_entry.error = event_data["error"]
+        tool_entry.completed_at = event_data.get("timestamp")
+    if (tool_entry.status, tool_entry.name) != header_state:
+        tool_entry.header_dirty = True
+    # Re-file the tool only when a field the indices are keyed on changed.
+    if (tool_entry.status, tool_entry.name, tool_entry.signature) != indexed_state:
+        if indexed_state is not None:
+            _unindex_tool(agent_entry, tool_key, indexed_state[1], indexed_state[2])
+        _index_tool(agent_entry, tool_entry)
+
+    tool_entry.last_event = event_type
+    tool_entry.last_updated = event_data.get("timestamp")
+    _record_history(tool_entry, event_type, event_data)
+
+    if event_type in _TERMINAL_TOOL_EVENTS:
         active_map.pop(signature, None)
 
 
-def _build_tool_key(event_data: Dict[str, Any]) -> str:
-    base = event_data.get("tool_name") or "tool"
-    attempt = event_data.get("run_attempts")
-    if attempt is None:
-        attempt = event_data.get("timestamp") or uuid.uuid4().hex
-    return f"{base}:{attempt}"
-
 def _check_future_completion() -> None:
     future: Optional[Future] = st.session_state.get("crew_future")
     if future is None or not future.done() or st.session_state.get("future_processed"):
@@ -733,192 +956,171 @@ def _check_future_completion() -> None:
         st.session_state["future_processed"] = True
 
 
-def _progress_fraction() -> float:
-    if st.session_state.get("status") == "idle":
+def _progress_fraction(status: str, completed: int) -> float:
+    if status == "idle":
         return 0.0
-    completed = len(st.session_state.get("completed_tasks", set()))
-    return min(completed / EXPECTED_TASKS, 0.999 if st.session_state.get("status") == "running" else 1.0)
+    return min(completed / EXPECTED_TASKS, 0.999 if status == "running" else 1.0)
+
+
+def _clock_time(timestamp: str) -> str:
+    """Return the ``HH:MM:SS`` part of an ISO-8601 timestamp."""
+
+    # Listener timestamps are always ``YYYY-MM-DDTHH:MM:SS...``, so slicing
+    # covers them; anything else goes through the full parser.
+    if len(timestamp) >= 19 and timestamp[10] in "T " and timestamp[13] == ":" and timestamp[16] == ":":
+        return timestamp[11:19]
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).strftime("%H:%M:%S")
+    except ValueError:
+        return timestamp
+
 
+def _prepare_feed_entry(event_type: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pre-format an event for the feed once, when it is received."""
 
-def _render_event_feed(events: List[Dict[str, Any]]) -> None:
+    timestamp = event_data.get("timestamp")
+    if isinstance(timestamp, str):
+        timestamp_display = _clock_time(timestamp)
+    else:
+        timestamp_display = ""
+
+    badge = _EVENT_LABELS.get(event_type, event_type)
+    header = badge if not timestamp_display else f"{badge} · {timestamp_display}"
+
+    highlights = [
+        f"{key.replace('_', ' ').title()}: {event_data[key]}"
+        for key in _FEED_HIGHLIGHT_KEYS
+        if event_data.get(key)
+    ]
+    details = {
+        key: value
+        for key, value in event_data.items()
+        if key not in _FEED_HIGHLIGHT_KEYS and key != "timestamp"
+    }
+
+    return {
+        "header": f"**{header}**",
+        "caption": " · ".join(highlights) if highlights else None,
+        "details": details,
+    }
+
+
+def _render_event_feed(events: Deque[ListenerEvent], seen: int) -> None:
     if not events:
         st.caption("Event feed will appear here once the run starts.")
         return
 
-    label_map = {
-        "crew:kickoff-started": "Crew kickoff started",
-        "crew:kickoff-completed": "Crew kickoff completed",
-        "crew:kickoff-failed": "Crew kickoff failed",
-        "task:started": "Task started",
-        "task:completed": "Task completed",
-        "task:failed": "Task failed",
-        "agent:started": "Agent execution started",
-        "agent:completed": "Agent execution completed",
-        "agent:error": "Agent execution error",
-        "tool:started": "Tool started",
-        "tool:finished": "Tool finished",
-        "tool:error": "Tool error",
-        "run:completed": "Run completed",
-        "run:failed": "Run failed",
-    }
+    if seen > len(events):
+        st.caption(f"Showing the latest {len(events)} of {seen} events.")
 
     for event in events:
-        event_type = event.get("type", "event:unknown")
-        event_data = event.get("event", {})
-        timestamp = event_data.get("timestamp")
-        if isinstance(timestamp, str):
-            try:
-                timestamp_display = datetime.fromisoformat(timestamp.replace("Z", "+00:00")).strftime("%H:%M:%S")
-            except ValueError:
-                timestamp_display = timestamp
-        else:
-            timestamp_display = ""
-
-        badge = label_map.get(event_type, event_type)
+        entry = event.rendered
+        if entry is None:
+            entry = event.rendered = _prepare_feed_entry(event.type or "event:unknown", event.event or {})
 
         with st.container():
-            header = badge if not timestamp_display else f"{badge} · {timestamp_display}"
-            st.markdown(f"**{header}**")
-
-            highlight_keys = [
-                "crew_name",
-                "crew_id",
-                "agent_role",
-                "task_name",
-                "task_id",
-                "tool_name",
-                "status",
-            ]
-            highlights = [
-                f"{key.replace('_', ' ').title()}: {event_data[key]}"
-                for key in highlight_keys
-                if event_data.get(key)
-            ]
-            if highlights:
-                st.caption(" · ".join(highlights))
-
-            details = {
-                key: value
-                for key, value in event_data.items()
-                if key not in highlight_keys and key not in {"timestamp"}
-            }
-            if details:
+            st.markdown(entry["header"])
+            if entry["caption"]:
+                st.caption(entry["caption"])
+            if entry["details"]:
                 with st.expander("Details", expanded=False):
-                    st.json(details)
+                    st.json(entry["details"])
 
 
-def _render_agent_tree(task_registry: Dict[str, Any]) -> None:
+def _render_agent_tree(task_registry: Dict[str, TaskEntry]) -> None:
     if not task_registry:
         st.caption("Agent activity will appear here once the run starts.")
         return
 
-    tasks_sorted = sorted(
-        task_registry.values(),
-        key=lambda item: (item.get("first_seen") or "", item.get("task_id", "")),
-    )
+    # Idle reruns see the same registry, so the ordering is kept until a
+    # drain bumps ``render_version``.
+    state = st.session_state
+    version = state.get("render_version", 0)
+    cached_order = state.get("timeline_order")
+    if cached_order is not None and cached_order[0] == version:
+        tasks_sorted = cached_order[1]
+    else:
+        tasks_sorted = sorted(
+            task_registry.values(),
+            key=lambda item: (item.first_seen or "", item.task_id),
+        )
+        state["timeline_order"] = (version, tasks_sorted)
 
     for task in tasks_sorted:
-        task_status = task.get("status", "pending")
-        task_icon, task_color = _status_visual(task_status)
-        task_name = task.get("name") or task.get("task_id") or "Task"
-        task_header = (
-            f"<div style='margin-bottom:0.5rem;'>"
-            f"<div><strong>{task_icon} Task: {html.escape(task_name)}</strong></div>"
-            f"<div style='margin-left:1.2rem;color:{task_color};font-size:0.85rem;'>Status: {task_status.title()}</div>"
-            f"</div>"
-        )
+        # Streamlit drops any element a rerun does not emit again, so every task
+        # is drawn each time; only the plan is reused while nothing changed.
+        if task.render_plan is None or task.render_version != task.version:
+            task.render_plan = _task_render_plan(task)
+            task.render_version = task.version
+
         task_container = st.container()
-        task_container.markdown(task_header, unsafe_allow_html=True)
+        for op in task.render_plan:
+            if op[0] == "markup":
+                task_container.markdown(op[1], unsafe_allow_html=True)
+            else:
+                _render_details(op[1], op[2], target=task_container, indent_ratio=0.04)
+
+
+def _task_render_plan(task: TaskEntry) -> List[RenderOp]:
+    """Lay out a task's timeline as a list of elements to emit."""
+
+    plan: List[RenderOp] = []
+    # Headers and error notes are static HTML: consecutive ones are sent as
+    # a single markdown element, flushed only before an interactive expander.
+    markup: List[str] = [_header_html(task, _TASK_HEADER_TMPL, task.name or task.task_id or "Task")]
 
-        agents = sorted(
-            task.get("agents", {}).values(),
-            key=lambda item: (item.get("first_seen") or "", item.get("agent_role") or ""),
+    def flush_markup() -> None:
+        if markup:
+            plan.append(("markup", "".join(markup)))
+            markup.clear()
+
+    agents = sorted(
+        task.agents.values(),
+        key=lambda item: (item.first_seen or "", item.agent_role or ""),
+    )
+    if not agents:
+        markup.append(_AWAITING_AGENTS_HTML)
+
+    for agent in agents:
+        markup.append(_header_html(agent, _AGENT_HEADER_TMPL, agent.agent_role or "Agent"))
+
+        if agent.output:
+            flush_markup()
+            plan.append(("details", "Agent output", agent.output))
+
+        if agent.error:
+            markup.append(_AGENT_ERROR_TMPL.format(error=html.escape(str(agent.error))))
+
+        tools = sorted(
+            agent.tools.values(),
+            key=lambda item: (item.first_seen or "", item.name or ""),
         )
-        if not agents:
-            task_container.markdown(
-                "<div style='margin-left:1.2rem;color:#9ca3af;font-size:0.85rem;'>Awaiting agent activity…</div>",
-                unsafe_allow_html=True,
-            )
-            continue
+        for tool in tools:
+            markup.append(_header_html(tool, _TOOL_HEADER_TMPL, tool.name or "Tool"))
 
-        for agent in agents:
-            agent_status = agent.get("status", "pending")
-            agent_icon, agent_color = _status_visual(agent_status)
-            agent_role = agent.get("agent_role") or "Agent"
-            agent_header = (
-                f"<div style='margin-left:1.2rem;margin-bottom:0.25rem;'>"
-                f"<div><strong>{agent_icon} Agent: {html.escape(agent_role)}</strong></div>"
-                f"<div style='margin-left:1.2rem;color:{agent_color};font-size:0.8rem;'>Status: {agent_status.title()}</div>"
-                f"</div>"
-            )
-            agent_container = task_container.container()
-            agent_container.markdown(agent_header, unsafe_allow_html=True)
-
-            if agent.get("output"):
-                _render_details(
-                    "Agent output",
-                    agent["output"],
-                    target=agent_container,
-                    indent_ratio=0.04,
-                )
-
-            if agent.get("error"):
-                agent_container.markdown(
-                    f"<div style='margin-left:2.4rem;color:#ef4444;font-size:0.85rem;'>Error: {html.escape(str(agent['error']))}</div>",
-                    unsafe_allow_html=True,
-                )
-
-            tools = sorted(
-                agent.get("tools", {}).values(),
-                key=lambda item: (item.get("first_seen") or "", item.get("name") or ""),
-            )
-            for tool in tools:
-                tool_status = tool.get("status", "pending")
-                tool_icon, tool_color = _status_visual(tool_status)
-                tool_name = tool.get("name") or "Tool"
-                tool_header = (
-                    f"<div style='margin-left:2.4rem;margin-bottom:0.15rem;'>"
-                    f"<div>{tool_icon} {html.escape(tool_name)}"
-                    f"<span style='color:{tool_color};font-size:0.75rem;margin-left:0.5rem;'>{tool_status.title()}</span></div>"
-                    f"</div>"
-                )
-                tool_container = agent_container.container()
-                tool_container.markdown(tool_header, unsafe_allow_html=True)
-
-                if tool.get("output"):
-                    _render_details(
-                        "Tool output",
-                        str(tool["output"]),
-                        target=tool_container,
-                        indent_ratio=0.04,
-                    )
-                if tool.get("error") is not None:
-                    tool_container.markdown(
-                        "<div style='margin-left:3.2rem;color:#ef4444;font-size:0.75rem;margin-bottom:0.2rem;'>Error encountered</div>",
-                        unsafe_allow_html=True,
-                    )
-                    _render_details(
-                        "Error details",
-                        tool["error"],
-                        target=tool_container,
-                        indent_ratio=0.04,
-                    )
+            if tool.output:
+                flush_markup()
+                plan.append(("details", "Tool output", str(tool.output)))
+            if tool.error is not None:
+                markup.append(_TOOL_ERROR_HTML)
+                flush_markup()
+                plan.append(("details", "Error details", tool.error))
+
+    flush_markup()
+    return plan
 
 
 def _render_status_panel(company: str) -> None:
-    status = st.session_state.get("status", "idle")
-    progress = _progress_fraction()
-    status_badge = {
-        "idle": "grey",
-        "running": "orange",
-        "completed": "green",
-        "failed": "red",
-    }.get(status, "grey")
+    state = st.session_state
+    status = state.get("status", "idle")
+    completed = len(state.get("completed_tasks", ()))
+    progress = _progress_fraction(status, completed)
+    status_badge = _STATUS_BADGES.get(status, "grey")
 
     st.markdown(f"### Run status")
     st.markdown(f"<span style='color:{status_badge};font-size:1.1rem;'>●</span> **{status.title()}**", unsafe_allow_html=True)
     st.progress(progress)
-    st.caption(f"{len(st.session_state.get('completed_tasks', []))}/{EXPECTED_TASKS} tasks completed")
+    st.caption(f"{completed}/{EXPECTED_TASKS} tasks completed")
     st.caption(f"Tracking company: **{company}**")
 
 
@@ -932,6 +1134,7 @@ def _render_output_panel() -> None:
 
 
 def main() -> None:
+    frame_started = time.monotonic()
     _init_session_state()
 
     st.title("📈 Financial Crew Live Monitor")
@@ -960,7 +1163,7 @@ def main() -> None:
             else:
                 st.warning("Please provide a company or ticker symbol.")
 
-    _drain_event_queue()
+    drained = _drain_event_queue()
     _check_future_completion()
 
     left, right = st.columns([0.5, 0.5])
@@ -978,10 +1181,10 @@ def main() -> None:
 
         with tab_feed:
             st.markdown("### Event feed")
-            _render_event_feed(st.session_state.get("events", []))
+            _render_event_feed(st.session_state["events"], st.session_state["events_seen"])
 
     if st.session_state.get("status") == "running":
-        time.sleep(0.2)
+        _wait_for_events(frame_started, _poll_interval(drained))
         st.rerun()
 
 
@@ -0,0 +1,79 @@
+"""Split LLM output into markdown and ``<think>`` reasoning segments.
+
+Kept out of ``streamlit_app.py`` because Streamlit re-executes its main script
+as a fresh module on every rerun; caches defined here survive between reruns.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import List, Tuple
+
+THINK_PATTERN = re.compile(r"<think>(.*?)</think>", re.IGNORECASE | re.DOTALL)
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+
+@functools.lru_cache(maxsize=256)
+def split_text_with_think_sections(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Split ``text`` into markdown and ``<think>`` segments.
+
+    The same agent outputs are re-rendered on every rerun, so segmentation is
+    memoised per text; the result is a tuple so cached values stay immutable.
+    """
+
+    if not text:
+        return ()
+
+    segments: List[Tuple[str, str]] = []
+    last_index = 0
+
+    for start, content_start, content_end, end in _think_spans(text):
+        normal_segment = text[last_index:start]
+        if normal_segment.strip():
+            segments.append(("markdown", normal_segment))
+
+        think_content = text[content_start:content_end].strip()
+        if think_content:
+            segments.append(("think", think_content))
+        last_index = end
+
+    remainder = text[last_index:]
+    if remainder.strip():
+        segments.append(("markdown", remainder))
+
+    if not segments:
+        segments.append(("markdown", text))
+
+    return tuple(segments)
+
+
+def _think_spans(text: str) -> List[Tuple[int, int, int, int]]:
+    """Locate ``<think>...</think>`` blocks as (start, body start, body end, end).
+
+    Scans with ``str.find`` on a lowered copy, which is linear even when an
+    opening tag is never closed; matches what ``THINK_PATTERN.finditer`` finds.
+    """
+
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Some characters change length when lowered; offsets would drift.
+        return [
+            (match.start(), match.start(1), match.end(1), match.end())
+            for match in THINK_PATTERN.finditer(text)
+        ]
+
+    spans: List[Tuple[int, int, int, int]] = []
+    position = 0
+    while True:
+        start = lowered.find(_THINK_OPEN, position)
+        if start < 0:
+            break
+        content_start = start + len(_THINK_OPEN)
+        content_end = lowered.find(_THINK_CLOSE, content_start)
+        if content_end < 0:
+            break
+        position = content_end + len(_THINK_CLOSE)
+        spans.append((start, content_start, content_end, position))
+    return spans
@@ -0,0 +1,119 @@
+"""Persistent file cache for tool responses."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Callable, TypeVar
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+_UNSAFE_PATH_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _cache_dir() -> str:
+    return os.environ.get("TOOL_CACHE_DIR", ".cache")
+
+
+def _cache_path(tool_name: str, params: dict[str, Any]) -> str:
+    """Return ``{cache_dir}/{tool_name}/{md5(params)}.json`` for a tool call."""
+
+    encoded = json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    digest = hashlib.md5(encoded).hexdigest()
+    folder = _UNSAFE_PATH_CHARS.sub("_", tool_name).strip("_") or "tool"
+    return os.path.join(_cache_dir(), folder, f"{digest}.json")
+
+
+def _read(path: str, ttl: float) -> tuple[bool, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            entry = json.load(handle)
+    except (OSError, ValueError):
+        return False, None
+
+    if not isinstance(entry, dict):
+        return False, None
+    created = entry.get("created")
+    # Hand-edited or foreign files may carry any value here; treat them as misses.
+    if not isinstance(created, (int, float)) or isinstance(created, bool) or time.time() - created > ttl:
+        return False, None
+    return True, entry.get("result")
+
+
+def _write(path: str, result: Any) -> None:
+    folder = os.path.dirname(path)
+    tmp_path = None
+    try:
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({"created": time.time(), "result": result}, handle)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):  # pragma: no cover - cache is best effort
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def cached_call(
+    namespace: str,
+    params: dict[str, Any],
+    ttl: float,
+    compute: Callable[[], Any],
+    *,
+    cache_if: Callable[[Any], bool] = bool,
+) -> Any:
+    """Return the cached result for ``params`` under ``namespace``, computing it on a miss.
+
+    Results rejected by ``cache_if`` are returned but not stored.
+    """
+
+    path = _cache_path(namespace, params)
+    hit, result = _read(path, ttl)
+    if hit:
+        return result
+
+    result = compute()
+    if cache_if(result):
+        _write(path, result)
+    return result
+
+
+def file_cache(ttl: float, *, cache_if: Callable[[Any], bool] = bool) -> Callable[[_F], _F]:
+    """Cache a tool's ``_run`` result on disk for ``ttl`` seconds.
+
+    Entries are keyed by the tool name and the call arguments, so every tool
+    instance (and every process) shares the same cache. Results rejected by
+    ``cache_if`` (by default, empty responses) are returned but not stored.
+    """
+
+    def decorator(func: _F) -> _F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(self, *args, **kwargs)
+            params = dict(bound.arguments)
+            params.pop(next(iter(signature.parameters)), None)
+
+            return cached_call(
+                getattr(self, "name", type(self).__name__),
+                params,
+                ttl,
+                lambda: func(self, *args, **kwargs),
+                cache_if=cache_if,
+            )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import ast
-import operator
-from typing import Callable, Dict, Type
+import functools
+from types import CodeType
+from typing import Type
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
@@ -18,6 +19,43 @@ class _CalculatorToolInput(BaseModel):
 	)
 
 
+_ALLOWED_BINARY_OPERATORS = frozenset({ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow})
+_ALLOWED_UNARY_OPERATORS = frozenset({ast.UAdd, ast.USub})
+_ALLOWED_NODES = frozenset({ast.Expression, ast.BinOp, ast.UnaryOp}) | _ALLOWED_BINARY_OPERATORS | _ALLOWED_UNARY_OPERATORS
+
+# Compiled code never sees builtins, names or attributes: the whitelist only
+# admits numeric literals combined with the operators above.
+_EVAL_GLOBALS = {"__builtins__": {}}
+
+
+def _check_node(node: ast.AST) -> None:
+	"""Reject any AST node that is not part of plain arithmetic."""
+
+	node_type = type(node)
+	if node_type is ast.Constant:
+		value = node.value
+		if isinstance(value, (int, float)) and not isinstance(value, bool):
+			return
+		raise ValueError("Only numeric literals are allowed.")
+	if node_type in _ALLOWED_NODES:
+		return
+	if isinstance(node, ast.operator):
+		raise ValueError(f"Operator {node_type.__name__} is not allowed.")
+	if isinstance(node, ast.unaryop):
+		raise ValueError(f"Unary operator {node_type.__name__} is not allowed.")
+	raise ValueError("Unsupported expression component encountered.")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expression(expression: str) -> CodeType:
+	"""Parse, validate and compile ``expression``; repeated inputs reuse the code object."""
+
+	tree = ast.parse(expression, mode="eval")
+	for node in ast.walk(tree):
+		_check_node(node)
+	return compile(tree, "<calculator>", "eval")
+
+
 class CalculatorTool(BaseTool):
 	"""Tool that safely evaluates math expressions using Python's AST module."""
 
@@ -27,59 +65,14 @@ class CalculatorTool(BaseTool):
 	)
 	args_schema: Type[BaseModel] = _CalculatorToolInput
 
-	_ALLOWED_BINARY_OPERATORS: Dict[type, Callable[[float, float], float]] = {
-		ast.Add: operator.add,
-		ast.Sub: operator.sub,
-		ast.Mult: operator.mul,
-		ast.Div: operator.truediv,
-		ast.FloorDiv: operator.floordiv,
-		ast.Mod: operator.mod,
-		ast.Pow: operator.pow,
-	}
-	_ALLOWED_UNARY_OPERATORS: Dict[type, Callable[[float], float]] = {
-		ast.UAdd: operator.pos,
-		ast.USub: operator.neg,
-	}
-
 	def _run(self, expression: str) -> str:  # pragma: no cover - 
 		"""Evaluate the provided math expression and return the result as a string."""
 
 		try:
-			parsed = ast.parse(expression, mode="eval")
-			result = self._evaluate(parsed.body)
+			code = _compile_expression(expression)
+			result = eval(code, _EVAL_GLOBALS, {})
 			return str(result)
 		except ZeroDivisionError as exc:  # pragma: no cover - guardrail
 			raise ValueError("Division by zero is not allowed.") from exc
 		except Exception as exc:  # pragma: no cover - general safety
 			raise ValueError("Invalid expression provided.") from exc
-
-	def _evaluate(self, node: ast.AST) -> float:
-		"""Recursively evaluate an AST node representing a safe arithmetic expression."""
-
-		if isinstance(node, ast.Constant):
-			value = ast.literal_eval(node)
-			if isinstance(value, (int, float)) and not isinstance(value, bool):
-				return value
-			raise ValueError("Only numeric literals are allowed.")
-
-		if isinstance(node, ast.BinOp):
-			operator_type = type(node.op)
-			operator_fn = self._ALLOWED_BINARY_OPERATORS.get(operator_type)
-			if operator_fn is None:
-				raise ValueError(f"Operator {operator_type.__name__} is not allowed.")
-			left_value = self._evaluate(node.left)
-			right_value = self._evaluate(node.right)
-			return operator_fn(left_value, right_value)
-
-		if isinstance(node, ast.UnaryOp):
-			operator_type = type(node.op)
-			operator_fn = self._ALLOWED_UNARY_OPERATORS.get(operator_type)
-			if operator_fn is None:
-				raise ValueError(f"Unary operator {operator_type.__name__} is not allowed.")
-			operand_value = self._evaluate(node.operand)
-			return operator_fn(operand_value)
-
-		if isinstance(node, ast.Expr):
-			return self._evaluate(node.value)
-
-		raise ValueError("Unsupported expression component encountered.")
@@ -1,14 +1,64 @@
+import functools
 import json
 import os
-from typing import Type, ClassVar
+from typing import Iterator, List, Type
 
 from pydantic import BaseModel, Field
 import requests
+from requests.adapters import HTTPAdapter
 from langchain_community.tools.yahoo_finance_news import (
     YahooFinanceNewsTool as langchain_yfinance_tool,
 )
 from crewai.tools import BaseTool
 
+from tools.cache import DAY, HOUR, file_cache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+# Both parsers take the raw body bytes, skipping requests' decode-to-str step.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Every Serper call goes through one pooled session, so repeated searches reuse
+# an open TLS connection instead of doing a fresh handshake per request.
+_SHARED_SESSION = requests.Session()
+_SHARED_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+
+_SERPER_URL = "https://google.serper.dev"
+# (connect, read) seconds; a stalled search should fail the tool call rather
+# than hold up the whole crew.
+_SERPER_TIMEOUT = (5, 10)
+_TOP_RESULTS = 4
+
+
+def _serper_search(endpoint: str, query: str) -> dict:
+    """POST ``query`` to a Serper.dev endpoint over the shared session."""
+
+    # ``json=`` encodes the body and sets the content type in one step. The key
+    # is read per call so a late-loaded .env is still honoured.
+    response = _SHARED_SESSION.post(
+        f"{_SERPER_URL}/{endpoint}",
+        headers={"X-API-KEY": os.environ.get("SERPER_API_KEY", "")},
+        json={"q": query},
+        timeout=_SERPER_TIMEOUT,
+    )
+    return _json_loads(response.content)
+
+
+def _format_results(results: List[dict]) -> Iterator[str]:
+    """Yield one text block per well-formed result among the top few."""
+
+    for result in results[:_TOP_RESULTS]:
+        title = result.get("title")
+        link = result.get("link")
+        snippet = result.get("snippet")
+        if title is None or link is None or snippet is None:
+            # skip malformed result
+            continue
+        yield f"Title: {title}\nLink: {link}\nSnippet: {snippet}\n\n-----------------"
+
 
 class _SearchToolInput(BaseModel):
     """Input schema for search tools."""
@@ -25,34 +75,10 @@ class SearchInternetTool(BaseTool):
     )
     args_schema: Type[BaseModel] = _SearchToolInput
 
+    @file_cache(ttl=DAY)
     def _run(self, query: str) -> str:
-        top_result_to_return = 4
-        url = "https://google.serper.dev/search"
-        payload = json.dumps({"q": query})
-        headers = {
-            "X-API-KEY": os.environ.get("SERPER_API_KEY", ""),
-            "content-type": "application/json",
-        }
-        response = requests.request("POST", url, headers=headers, data=payload)
-        results = response.json().get("organic", [])
-        string = []
-        for result in results[:top_result_to_return]:
-            try:
-                string.append(
-                    "\n".join(
-                        [
-                            f"Title: {result['title']}",
-                            f"Link: {result['link']}",
-                            f"Snippet: {result['snippet']}",
-                            "\n-----------------",
-                        ]
-                    )
-                )
-            except KeyError:
-                # skip malformed result
-                continue
-
-        return "\n".join(string)
+        results = _serper_search("search", query).get("organic", [])
+        return "\n".join(_format_results(results))
 
 
 class SearchNewsTool(BaseTool):
@@ -64,34 +90,10 @@ class SearchNewsTool(BaseTool):
     )
     args_schema: Type[BaseModel] = _SearchToolInput
 
+    @file_cache(ttl=HOUR)
     def _run(self, query: str) -> str:
-        top_result_to_return = 4
-        url = "https://google.serper.dev/news"
-        payload = json.dumps({"q": query})
-        headers = {
-            "X-API-KEY": os.environ.get("SERPER_API_KEY", ""),
-            "content-type": "application/json",
-        }
-        response = requests.request("POST", url, headers=headers, data=payload)
-        results = response.json().get("news", [])
-        string = []
-        for result in results[:top_result_to_return]:
-            try:
-                string.append(
-                    "\n".join(
-                        [
-                            f"Title: {result['title']}",
-                            f"Link: {result['link']}",
-                            f"Snippet: {result['snippet']}",
-                            "\n-----------------",
-                        ]
-                    )
-                )
-            except KeyError:
-                # skip malformed result
-                continue
-
-        return "\n".join(string)
+        results = _serper_search("news", query).get("news", [])
+        return "\n".join(_format_results(results))
 
 
 class _YahooFinanceNewsToolInput(BaseModel):
@@ -100,14 +102,19 @@ class _YahooFinanceNewsToolInput(BaseModel):
     query: str = Field(..., description="The ticker symbol of the stock or company name")
 
 
+@functools.cache
+def _langchain_yahoo_finance_news():
+    return langchain_yfinance_tool()
+
+
 class YahooFinanceNewsTool(BaseTool):
     name: str = "Yahoo Finance News"
     description: str = (
         "Search for news articles about a company or stock using Yahoo Finance"
     )
     args_schema: Type[BaseModel] = _YahooFinanceNewsToolInput
-    tool: ClassVar = langchain_yfinance_tool()
 
+    @file_cache(ttl=HOUR)
     def _run(self, query: str) -> str:
         """Use the tool."""
-        return self.tool.invoke(query)
+        return _langchain_yahoo_finance_news().invoke(query)
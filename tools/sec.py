@@ -1,17 +1,28 @@
+import functools
+import hashlib
 import os
-from typing import Type, cast
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Type, TypeVar, cast
 
+import numpy as np
 from pydantic import BaseModel, Field
 
-from langchain.text_splitter import CharacterTextSplitter
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 from langchain_ollama.embeddings import OllamaEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
 
 from edgar import Company, set_identity
 from edgar.entity.filings import EntityFiling
 
 from crewai.tools import BaseTool
 
+from tools.cache import DAY, HOUR, cached_call
+
 
 class _SECToolInput(BaseModel):
     """Common input schema: "TICKER|QUESTION"""
@@ -47,54 +58,166 @@ def _ensure_identity() -> str | None:
     return None
 
 
-def _embedding_search(content: str, ask: str) -> str:
-    if not content:
-        return "Couldn't retrieve filing content for analysis."
-    text_splitter = CharacterTextSplitter(
-        separator="\n",
-        chunk_size=1000,
-        chunk_overlap=150,
-        length_function=len,
-        is_separator_regex=False,
+_V = TypeVar("_V")
+
+
+class _BoundedCache(Generic[_V]):
+    """Thread-safe mapping that keeps only the ``maxsize`` most recently used entries.
+
+    With a ``ttl`` (seconds), entries older than that are treated as missing.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, _V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[_V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self._ttl is not None and time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: _V) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+# Filings never change once published, so their text and the FAISS index built
+# from it are kept for follow-up questions about the same document.
+_FILING_CONTENT: _BoundedCache[str] = _BoundedCache(maxsize=8)
+_RETRIEVERS: _BoundedCache[Any] = _BoundedCache(maxsize=32)
+# Chunks depend only on the text, so switching EMBEDDING_MODEL re-embeds
+# without re-splitting the filing.
+_FILING_CHUNKS: _BoundedCache[list[Document]] = _BoundedCache(maxsize=8)
+# Company handles and "latest filing" lookups are shared by the 10-K and 10-Q
+# tools; they expire hourly so a newly published filing is eventually picked up.
+_COMPANIES: _BoundedCache[Company] = _BoundedCache(maxsize=64, ttl=HOUR)
+_LATEST_FILINGS: _BoundedCache[EntityFiling] = _BoundedCache(maxsize=64, ttl=HOUR)
+
+
+@functools.cache
+def _embeddings(model: str, base_url: str) -> OllamaEmbeddings:
+    return OllamaEmbeddings(model=model, base_url=base_url)
+
+
+# Neighbours per node in the HNSW graph each filing's chunks are indexed in.
+_HNSW_NEIGHBOURS = 16
+# Chunks per Ollama /api/embed request: few enough round trips for a long
+# filing while keeping each request well inside the server's timeouts.
+_EMBED_BATCH_SIZE = 64
+
+_TEXT_SPLITTER = RecursiveCharacterTextSplitter(
+    separators=["\n\n", "\n", ". ", " "],
+    chunk_size=1000,
+    chunk_overlap=150,
+    is_separator_regex=False,
+)
+
+
+def _split_filing(content: str, content_hash: str) -> list[Document]:
+    docs = _FILING_CHUNKS.get(content_hash)
+    if docs is None:
+        # Filings repeat boilerplate (legends, cover-page notes) verbatim;
+        # embedding each copy only bloats the index.
+        unique_chunks = dict.fromkeys(_TEXT_SPLITTER.split_text(content))
+        docs = [Document(page_content=chunk) for chunk in unique_chunks]
+        _FILING_CHUNKS.put(content_hash, docs)
+    return docs
+
+
+def _embed_chunks(texts: list[str], embeddings: OllamaEmbeddings) -> list[list[float]]:
+    """Embed ``texts`` through Ollama's batch endpoint, ``_EMBED_BATCH_SIZE`` at a time."""
+
+    vectors: list[list[float]] = []
+    for start in range(0, len(texts), _EMBED_BATCH_SIZE):
+        vectors.extend(embeddings.embed_documents(texts[start : start + _EMBED_BATCH_SIZE]))
+    return vectors
+
+
+def _build_hnsw_store(docs: list[Document], texts: list[str], embeddings: OllamaEmbeddings) -> FAISS:
+    """Index ``docs`` in an HNSW graph instead of FAISS's default flat (exhaustive) index."""
+
+    faiss = dependable_faiss_import()
+    vectors = np.asarray(_embed_chunks(texts, embeddings), dtype=np.float32)
+    index = faiss.IndexHNSWFlat(vectors.shape[1], _HNSW_NEIGHBOURS)
+    index.add(vectors)
+    doc_ids = [str(position) for position in range(len(docs))]
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(doc_ids, docs))),
+        index_to_docstore_id=dict(enumerate(doc_ids)),
     )
-    docs = text_splitter.create_documents([content])
+
+
+def _build_retriever(content: str, content_hash: str) -> Any:
+    docs = _split_filing(content, content_hash)
     if not docs:
-        return "Filing content couldn't be segmented for retrieval."
-    retriever = FAISS.from_documents(
-        docs,
-        OllamaEmbeddings(
-            model=os.environ["EMBEDDING_MODEL"], base_url=os.environ["MODEL_BASE_URL"]
-        ),
-    ).as_retriever()
+        return None
+    embeddings = _embeddings(os.environ["EMBEDDING_MODEL"], os.environ["MODEL_BASE_URL"])
+    texts = [doc.page_content for doc in docs]
+    return _build_hnsw_store(docs, texts, embeddings).as_retriever()
+
+
+def _embedding_search(content: str, ask: str, source: str = "") -> tuple[str, bool]:
+    """Return ``(context, found)``; ``found`` is false when the text is a failure notice."""
+
+    if not content:
+        return "Couldn't retrieve filing content for analysis.", False
+
+    content_hash = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+    cache_key = (source, content_hash, os.environ.get("EMBEDDING_MODEL"))
+    retriever = _RETRIEVERS.get(cache_key)
+    if retriever is None:
+        retriever = _build_retriever(content, content_hash)
+        if retriever is None:
+            return "Filing content couldn't be segmented for retrieval.", False
+        _RETRIEVERS.put(cache_key, retriever)
+
     answers = retriever.get_relevant_documents(ask, top_k=4)
     answers = "\n\n".join([a.page_content for a in answers])
-    return answers or "No relevant sections found in the filing."
+    if not answers:
+        return "No relevant sections found in the filing.", False
+    return answers, True
 
 
-def _search_latest_form(stock: str, form: str, ask: str) -> str:
-    identity_error = _ensure_identity()
-    if identity_error:
-        return identity_error
+def _latest_filing(ticker: str, form: str) -> tuple[Optional[EntityFiling], Optional[str]]:
+    """Return ``(filing, None)`` for the latest ``form`` of ``ticker``, or ``(None, error)``."""
 
-    ticker = stock.strip()
-    if not ticker:
-        return "Ticker symbol is missing. Provide the ticker before the question."
+    filing_key = (ticker.upper(), form)
+    filing = _LATEST_FILINGS.get(filing_key)
+    if filing is not None:
+        return filing, None
 
-    try:
-        company = Company(ticker)
-    except Exception as exc:  # pragma: no cover - depends on remote state
-        return f"Error locating company for ticker '{ticker}': {exc}"
+    company = _COMPANIES.get(ticker.upper())
+    if company is None:
+        try:
+            company = Company(ticker)
+        except Exception as exc:  # pragma: no cover - depends on remote state
+            return None, f"Error locating company for ticker '{ticker}': {exc}"
 
-    if getattr(company, "not_found", False):
-        return f"Sorry, I couldn't find any company information for ticker '{ticker}'."
+        if getattr(company, "not_found", False):
+            return None, f"Sorry, I couldn't find any company information for ticker '{ticker}'."
+        _COMPANIES.put(ticker.upper(), company)
 
     try:
         filings = company.get_filings(form=form, amendments=False)
     except Exception as exc:  # pragma: no cover - remote call
-        return f"Failed to retrieve {form} filings for '{ticker}': {exc}"
+        return None, f"Failed to retrieve {form} filings for '{ticker}': {exc}"
 
     if len(filings) == 0:
-        return (
+        return None, (
             f"No {form} filings found for ticker '{ticker}'. The company may not have filed "
             f"a {form} yet or it might use a different form type."
         )
@@ -102,25 +225,71 @@ def _search_latest_form(stock: str, form: str, ask: str) -> str:
     try:
         filing = cast(EntityFiling, filings.latest())
     except Exception as exc:  # pragma: no cover - library edge case
-        return f"Unable to determine the latest {form} filing for '{ticker}': {exc}"
+        return None, f"Unable to determine the latest {form} filing for '{ticker}': {exc}"
+
+    _LATEST_FILINGS.put(filing_key, filing)
+    return filing, None
+
+
+class _UncachedAnswer(Exception):
+    """Carries a reply that is returned to the agent but must not be cached."""
+
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.text = text
+
+
+def _search_latest_form(stock: str, form: str, ask: str) -> str:
+    identity_error = _ensure_identity()
+    if identity_error:
+        return identity_error
+
+    ticker = stock.strip()
+    if not ticker:
+        return "Ticker symbol is missing. Provide the ticker before the question."
 
+    filing, lookup_error = _latest_filing(ticker, form)
+    if filing is None:
+        return lookup_error or f"Unable to determine the latest {form} filing for '{ticker}'."
+
+    filing_url = str(filing.filing_url)
+    # Answers are keyed by the resolved filing, not the ticker: once a newer
+    # filing is published, questions about the ticker miss and hit the new one.
     try:
-        content = filing.text()
-    except Exception as text_exc:  # pragma: no cover - network edge cases
-        try:
-            content = filing.html() or ""
-        except Exception:
-            content = ""
-        if not content:
-            return f"Couldn't download the {form} filing content: {text_exc}"
+        return cached_call(
+            "SEC filing answers",
+            {"filing_url": filing_url, "ticker": ticker.upper(), "ask": ask},
+            30 * DAY,
+            lambda: _answer_from_filing(filing, filing_url, ticker, form, ask),
+        )
+    except _UncachedAnswer as answer:
+        return answer.text
 
-    context = _embedding_search(content, ask)
+
+def _answer_from_filing(filing: EntityFiling, filing_url: str, ticker: str, form: str, ask: str) -> str:
+    content = _FILING_CONTENT.get(filing_url)
+    if content is None:
+        try:
+            content = filing.text()
+        except Exception as text_exc:  # pragma: no cover - network edge cases
+            try:
+                content = filing.html() or ""
+            except Exception:
+                content = ""
+            if not content:
+                raise _UncachedAnswer(f"Couldn't download the {form} filing content: {text_exc}")
+        if content:
+            _FILING_CONTENT.put(filing_url, content)
+
+    context, found = _embedding_search(content, ask, source=filing_url)
     header = (
         f"Ticker: {ticker.upper()}\n"
         f"Company: {getattr(filing, 'company', 'Unknown')}\n"
         f"Form: {filing.form} | Filed: {filing.filing_date}\n"
         f"URL: {filing.filing_url}\n\n"
     )
+    if not found:
+        raise _UncachedAnswer(header + context)
     return header + context
 
 